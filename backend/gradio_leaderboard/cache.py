@@ -0,0 +1,195 @@
+"""Content fingerprints and the LRU cache used to skip re-serializing unchanged tables."""
+
+from __future__ import annotations
+
+import functools
+import hashlib
+import threading
+from collections import OrderedDict, namedtuple
+from typing import TYPE_CHECKING, Any, Callable, Hashable, List, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+    from pandas.io.formats.style import Styler
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "maxsize", "currsize"])
+
+
+class LRUCache:
+    """A thread-safe, bounded mapping that evicts the least recently used entry.
+
+    `on_evict` is called with the key and value of every entry that is evicted, replaced
+    or cleared.
+    """
+
+    def __init__(
+        self, maxsize: int, on_evict: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[Hashable, Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Optional[Hashable]) -> Any:
+        """Returns the cached value for `key`, or None. A None key is always a miss."""
+        with self._lock:
+            if key is not None and key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: Optional[Hashable], value: Any) -> None:
+        if key is None or self.maxsize <= 0:
+            return
+        evicted = []
+        with self._lock:
+            if key in self._data:
+                evicted.append((key, self._data[key]))
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                evicted.append(self._data.popitem(last=False))
+        if self.on_evict is not None:
+            for item in evicted:
+                self.on_evict(*item)
+
+    def info(self) -> CacheInfo:
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.maxsize, len(self._data))
+
+    def clear(self) -> None:
+        with self._lock:
+            evicted = list(self._data.items())
+            self._data.clear()
+            self.hits = self.misses = 0
+        if self.on_evict is not None:
+            for item in evicted:
+                self.on_evict(*item)
+
+
+def _update_with_series(digest: Any, series: pd.Series) -> None:
+    import pandas as pd
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        # plain numpy columns: hashing the raw buffer is several times faster
+        digest.update(np.ascontiguousarray(series.to_numpy()))
+        return
+    if dtype == object:
+        # hash_pandas_object hashes the string form of values that are not strings, so
+        # [1, 2] and ["1", "2"] would collide without their types
+        from pandas.api.types import infer_dtype
+
+        kind = infer_dtype(series, skipna=True)
+        digest.update(kind.encode())
+        if kind.startswith("mixed"):
+            types = [f"{type(v).__module__}.{type(v).__qualname__}" for v in series]
+            digest.update(pd.util.hash_array(np.array(types, dtype=object)))
+    try:
+        hashes = pd.util.hash_pandas_object(series, index=False).to_numpy()
+    except TypeError:
+        # unhashable cells such as lists
+        hashes = pd.util.hash_pandas_object(series.astype(str), index=False).to_numpy()
+    digest.update(hashes)
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """A digest of the index, column names, dtypes and every value of `df`."""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr([(str(c), str(t)) for c, t in df.dtypes.items()]).encode())
+    if isinstance(df.index, pd.RangeIndex):
+        digest.update(repr(df.index).encode())
+    else:
+        digest.update(pd.util.hash_pandas_object(df.index).to_numpy())
+    for i in range(df.shape[1]):
+        _update_with_series(digest, df.iloc[:, i])
+    return digest.hexdigest()[:32]
+
+
+def series_fingerprint(series: pd.Series) -> str:
+    """A digest of the dtype and values of `series`, ignoring its name and index."""
+    digest = hashlib.sha256(str(series.dtype).encode())
+    _update_with_series(digest, series)
+    return digest.hexdigest()[:32]
+
+
+class _Unhashable(Exception):
+    pass
+
+
+def _token(obj: Any, functions: List[Callable]) -> str:
+    """A stable string for the arguments a Styler was configured with. The functions
+    it is identified by are appended to `functions`.
+
+    Raises `_Unhashable` for objects whose identity cannot be captured safely.
+    """
+    import pandas as pd
+
+    if obj is None or isinstance(obj, (bool, int, float, str, bytes)):
+        return repr(obj)
+    if isinstance(obj, (np.generic,)):
+        return repr(obj.item())
+    if isinstance(obj, (list, tuple)):
+        return f"({','.join(_token(o, functions) for o in obj)})"
+    if isinstance(obj, dict):
+        items = (f"{_token(k, functions)}:{_token(v, functions)}" for k, v in obj.items())
+        return f"{{{','.join(items)}}}"
+    if isinstance(obj, functools.partial):
+        args = (obj.func, obj.args, obj.keywords)
+        return f"partial({','.join(_token(a, functions) for a in args)})"
+    if isinstance(obj, np.ndarray):
+        return f"ndarray({obj.dtype},{obj.shape},{hashlib.blake2b(np.ascontiguousarray(obj).tobytes(), digest_size=16).hexdigest()})"
+    if isinstance(obj, (pd.Series, pd.DataFrame)):
+        return f"{type(obj).__name__}({frame_fingerprint(pd.DataFrame(obj))})"
+    if callable(obj) and hasattr(obj, "__qualname__"):
+        # functions are compared by identity: a new lambda on every call is a miss
+        functions.append(obj)
+        return f"{obj.__module__}.{obj.__qualname__}@{id(obj)}"
+    raise _Unhashable(type(obj))
+
+
+def styler_fingerprint(
+    styler: Styler, functions: Optional[List[Callable]] = None
+) -> Optional[str]:
+    """A digest of a Styler's data and styling, or None if it cannot be fingerprinted.
+
+    Functions are identified by their id, which is reused once they are garbage
+    collected: the functions appended to `functions` must be kept alive for as long
+    as the digest is looked up.
+    """
+    functions = functions if functions is not None else []
+    formatters: dict[int, tuple[Any, list]] = {}
+    for cell, formatter in styler._display_funcs.items():  # type: ignore
+        formatters.setdefault(id(formatter), (formatter, []))[1].append(cell)
+    try:
+        config = _token(
+            [
+                # the first element of each entry is a lambda created by Styler.apply
+                [(args, kwargs) for _, args, kwargs in styler._todo],  # type: ignore
+                sorted(
+                    (
+                        _token(formatter, functions),
+                        _token(np.asarray(sorted(cells)), functions),
+                    )
+                    for formatter, cells in formatters.values()
+                ),
+                list(styler.hidden_rows),
+                list(styler.hidden_columns),
+                styler.table_styles,
+            ],
+            functions,
+        )
+    except _Unhashable:
+        return None
+    digest = hashlib.blake2b(config.encode(), digest_size=16)
+    digest.update(frame_fingerprint(styler.data).encode())  # type: ignore
+    return digest.hexdigest()
@@ -0,0 +1,90 @@
+"""Row-level diffs between two versions of a leaderboard keyed by a primary column."""
+
+from __future__ import annotations
+
+import base64
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional
+
+import numpy as np
+from gradio.data_classes import GradioModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class DataframeDelta(GradioModel):
+    base_version: str
+    key: str
+    upserts: List[List[Any]]
+    deletes: List[Any]
+    order: Optional[str] = None
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    import pandas as pd
+
+    try:
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+    except TypeError:
+        # unhashable cells such as lists
+        return pd.util.hash_pandas_object(df.astype(str), index=False).to_numpy()
+
+
+class RowSnapshot(NamedTuple):
+    """What is needed to diff against a version without holding on to its DataFrame."""
+
+    version: str
+    columns: List[str]
+    keys: pd.Index
+    hashes: np.ndarray
+
+
+def snapshot(df: pd.DataFrame, key: str, version: str) -> Optional[RowSnapshot]:
+    """Returns None if `key` is missing from `df` or not unique."""
+    import pandas as pd
+
+    if key not in df.columns:
+        return None
+    keys = pd.Index(df[key])
+    if not keys.is_unique:
+        return None
+    return RowSnapshot(version, list(df.columns), keys, _row_hashes(df))
+
+
+def compute_delta(
+    base: RowSnapshot,
+    new: RowSnapshot,
+    df: pd.DataFrame,
+    key: str,
+    max_fraction: float = 0.5,
+) -> Optional[DataframeDelta]:
+    """The upserts and deletes that turn `base` into `new` (whose data is `df`).
+
+    Upserted rows that are new are appended by the client, so `order` (base64 int32
+    positions into the patched rows) is only sent when that does not reproduce the row
+    order of `df`. Returns None when the columns differ or more than `max_fraction` of
+    the rows changed, in which case the full table should be sent.
+    """
+    if base.columns != new.columns:
+        return None
+    old_positions = base.keys.get_indexer(new.keys)
+    is_new = old_positions == -1
+    changed = is_new.copy()
+    changed[~is_new] = base.hashes[old_positions[~is_new]] != new.hashes[~is_new]
+    deleted = new.keys.get_indexer(base.keys) == -1
+    if changed.sum() + deleted.sum() > max_fraction * max(len(df), 1):
+        return None
+
+    patched_keys = base.keys[~deleted].append(new.keys[is_new])
+    order = None
+    if not patched_keys.equals(new.keys):
+        positions = patched_keys.get_indexer(new.keys).astype("<i4")
+        order = base64.b64encode(positions.tobytes()).decode("ascii")
+    upserts = df[changed]
+    return DataframeDelta(
+        base_version=base.version,
+        key=key,
+        upserts=upserts.to_dict(orient="split")["data"] if len(upserts) else [],
+        deletes=base.keys[deleted].tolist(),
+        order=order,
+    )
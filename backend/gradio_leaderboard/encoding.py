@@ -0,0 +1,188 @@
+"""Compact columnar encoding of leaderboard data for the wire."""
+
+from __future__ import annotations
+
+import base64
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from gradio.data_classes import GradioModel
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class EncodedColumn(GradioModel):
+    dtype: str
+    data: str
+    categories: Optional[List[Any]] = None
+    decimals: Optional[int] = None
+
+
+_INT16 = np.iinfo(np.int16)
+_INT32 = np.iinfo(np.int32)
+# scores are rarely reported with more decimals than this
+MAX_DECIMALS = 6
+
+
+def _b64(array: np.ndarray) -> str:
+    return base64.b64encode(np.ascontiguousarray(array).tobytes()).decode("ascii")
+
+
+def _decimal_digits(values: np.ndarray) -> Optional[Tuple[np.ndarray, int]]:
+    """`values` times the smallest power of ten that makes them integers that fit
+    `int32`, and that number of decimals. None if there is no such power up to
+    `10**MAX_DECIMALS`. Missing values stay NaN.
+
+    A value `v` only counts as having `k` decimals if `round(v * 10**k) / 10**k` is `v`
+    exactly, so dividing the digits by `10**k` in the browser gives back the same float.
+    """
+    finite = values[~np.isnan(values)]
+    if np.isinf(finite).any():
+        return None
+    for decimals in range(MAX_DECIMALS + 1):
+        scale = 10.0**decimals
+        # most full-precision columns are ruled out by their first values
+        head = finite[:64]
+        if not np.array_equal(np.round(head * scale) / scale, head):
+            continue
+        digits = np.round(finite * scale)
+        if np.abs(digits).max(initial=0) > _INT32.max:
+            return None
+        if np.array_equal(digits / scale, finite):
+            return np.round(values * scale), decimals
+    return None
+
+
+def _encode_decimals(
+    values: np.ndarray, float32_is_lossless: bool
+) -> Optional[EncodedColumn]:
+    """Encodes `values` as integer digits to be divided by `10**decimals`, with the
+    smallest value of the integer type standing for missing. Only used when it is
+    smaller than `float32`, or when `float32` would lose precision."""
+    scaled = _decimal_digits(values)
+    if scaled is None:
+        return None
+    digits, decimals = scaled
+    largest = np.abs(digits[~np.isnan(digits)]).max(initial=0)
+    if largest <= _INT16.max:
+        integer_type, missing = "int16", _INT16.min
+    elif not float32_is_lossless:
+        integer_type, missing = "int32", _INT32.min
+    else:
+        return None
+    digits[np.isnan(digits)] = missing
+    data = _b64(digits.astype(np.dtype(integer_type).newbyteorder("<")))
+    return EncodedColumn(dtype=integer_type, data=data, decimals=decimals)
+
+
+def encode_column(series: pd.Series) -> EncodedColumn:
+    """Encodes `series` as a little-endian typed array.
+
+    Booleans become `uint8`, integers that fit become `int32` and other numbers `float64`
+    (`float32` when that is lossless), with missing values stored as NaN. Numbers with
+    at most `MAX_DECIMALS` decimals, such as scores rounded to two, are instead sent as
+    `int16` or `int32` digits with `decimals` set when that is smaller or lossless. All
+    other columns are dictionary encoded: `int32` codes into `categories`, with -1 for
+    missing.
+    """
+    from pandas.api.types import is_bool_dtype, is_float_dtype, is_integer_dtype
+
+    dtype = series.dtype
+    if is_bool_dtype(dtype) and not series.hasnans:
+        return EncodedColumn(dtype="uint8", data=_b64(series.to_numpy(dtype="<u1")))
+    if is_integer_dtype(dtype) and not series.hasnans:
+        values = series.to_numpy()
+        if not len(values) or (values.min() >= _INT32.min and values.max() <= _INT32.max):
+            return EncodedColumn(dtype="int32", data=_b64(values.astype("<i4")))
+    if is_integer_dtype(dtype) or is_float_dtype(dtype):
+        values = series.to_numpy(dtype="<f8", na_value=np.nan)
+        as_float32 = values.astype("<f4")
+        float32_is_lossless = np.array_equal(
+            as_float32.astype("<f8"), values, equal_nan=True
+        )
+        decimals = _encode_decimals(values, float32_is_lossless)
+        if decimals is not None:
+            return decimals
+        if float32_is_lossless:
+            return EncodedColumn(dtype="float32", data=_b64(as_float32))
+        return EncodedColumn(dtype="float64", data=_b64(values))
+    import pandas as pd
+
+    try:
+        codes, categories = pd.factorize(series)
+    except TypeError:
+        # unhashable cells (e.g. lists) are sent as-is, one category per row
+        codes, categories = np.arange(len(series)), series.to_numpy()
+    return EncodedColumn(
+        dtype="dictionary",
+        data=_b64(codes.astype("<i4")),
+        categories=list(categories),
+    )
+
+
+def encode_frame(df: pd.DataFrame) -> List[EncodedColumn]:
+    return [encode_column(df.iloc[:, i]) for i in range(df.shape[1])]
+
+
+def decode_column(column: EncodedColumn) -> np.ndarray:
+    raw = base64.b64decode(column.data)
+    if column.dtype == "dictionary":
+        import pandas as pd
+
+        codes = np.frombuffer(raw, dtype="<i4")
+        # the trailing None is what the -1 (missing) code points at
+        categories = pd.Series([*(column.categories or []), None], dtype=object)
+        return categories.to_numpy()[codes]
+    if column.dtype == "uint8":
+        return np.frombuffer(raw, dtype="<u1").astype(bool)
+    numpy_dtype = {"int16": "<i2", "int32": "<i4", "float32": "<f4", "float64": "<f8"}[
+        column.dtype
+    ]
+    values = np.frombuffer(raw, dtype=numpy_dtype)
+    if column.decimals is None:
+        return values
+    digits = values.astype("<f8")
+    digits[values == np.iinfo(values.dtype).min] = np.nan
+    return digits / 10.0**column.decimals
+
+
+def decode_frame(headers: List[str], columns: List[EncodedColumn]) -> pd.DataFrame:
+    import pandas as pd
+
+    return pd.DataFrame(
+        {i: decode_column(column) for i, column in enumerate(columns)}
+    ).set_axis(headers, axis=1)
+
+
+def restore_dtypes(df: pd.DataFrame, dtypes: Dict[str, Any]) -> pd.DataFrame:
+    """Casts the columns of `df`, as rebuilt from the wire, back to their known `dtypes`.
+
+    Restores what JSON and the columnar encoding lose, e.g. categoricals, nullable or
+    64-bit integers and datetimes sent as strings. Columns whose values do not fit
+    their dtype keep the inferred one.
+    """
+    import pandas as pd
+
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    restored = False
+    for i, column in enumerate(columns):
+        dtype = dtypes.get(str(column.name))
+        if dtype is None or column.dtype == dtype:
+            continue
+        if isinstance(dtype, np.dtype) and dtype.kind in "biu" and column.hasnans:
+            continue
+        try:
+            restored_column = column.astype(dtype)
+        except (TypeError, ValueError):
+            continue
+        if restored_column.isna().sum() > column.isna().sum():
+            # e.g. values that are not categories of a categorical dtype
+            continue
+        columns[i] = restored_column
+        restored = True
+    if not restored:
+        return df
+    # rebuilt by position rather than with `DataFrame.isetitem`, which needs pandas 1.5,
+    # as headers may be repeated
+    return pd.DataFrame(dict(enumerate(columns))).set_axis(df.columns, axis=1)
@@ -0,0 +1,109 @@
+"""Opt-in timings of the work done by a `Leaderboard` on the server."""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+logger = logging.getLogger("gradio_leaderboard")
+
+
+@dataclass
+class TimingEvent:
+    """One timed call. Fields that do not apply to the operation are None."""
+
+    operation: str
+    seconds: float = 0.0
+    rows: Optional[int] = None
+    columns: Optional[int] = None
+    bytes: Optional[int] = None
+    cache_hit: Optional[bool] = None
+
+
+def payload_size(payload: Any) -> int:
+    """Size in bytes of `payload` serialized the way Gradio sends it."""
+    import orjson
+
+    if hasattr(payload, "model_dump"):
+        payload = payload.model_dump()
+    return len(
+        orjson.dumps(
+            payload,
+            option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_PASSTHROUGH_DATETIME,
+            default=str,
+        )
+    )
+
+
+class Timings:
+    """Aggregates the `TimingEvent`s of a leaderboard by operation.
+
+    Every event is logged at DEBUG level on the "gradio_leaderboard" logger and passed
+    to `callback` if given.
+    """
+
+    def __init__(self, callback: Optional[Callable[[TimingEvent], None]] = None):
+        self.callback = callback
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def time(self, operation: str) -> Iterator[TimingEvent]:
+        """Times the body of the `with` block, which can fill in the yielded event."""
+        event = TimingEvent(operation)
+        start = time.perf_counter()
+        try:
+            yield event
+        finally:
+            event.seconds = time.perf_counter() - start
+            self.record(event)
+
+    def record(self, event: TimingEvent) -> None:
+        with self._lock:
+            totals = self._totals.setdefault(
+                event.operation,
+                {"calls": 0, "total_seconds": 0.0, "max_seconds": 0.0, "bytes": 0},
+            )
+            totals["calls"] += 1
+            totals["total_seconds"] += event.seconds
+            totals["max_seconds"] = max(totals["max_seconds"], event.seconds)
+            totals["bytes"] += event.bytes or 0
+            if event.rows is not None:
+                totals["rows"] = event.rows
+            if event.columns is not None:
+                totals["columns"] = event.columns
+            if event.cache_hit is not None:
+                key = "cache_hits" if event.cache_hit else "cache_misses"
+                totals[key] = totals.get(key, 0) + 1
+        if logger.isEnabledFor(logging.DEBUG):
+            details = " ".join(
+                f"{name}={getattr(event, name)}"
+                for name in ("rows", "columns", "bytes", "cache_hit")
+                if getattr(event, name) is not None
+            )
+            logger.debug(
+                "%s took %.2f ms %s", event.operation, event.seconds * 1000, details
+            )
+        if self.callback is not None:
+            self.callback(event)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Calls, total, mean and max seconds, bytes sent, last row and column counts
+        and cache hit rate of every operation."""
+        with self._lock:
+            summary = {}
+            for operation, totals in self._totals.items():
+                summary[operation] = {
+                    **totals,
+                    "mean_seconds": totals["total_seconds"] / totals["calls"],
+                }
+                lookups = totals.get("cache_hits", 0) + totals.get("cache_misses", 0)
+                if lookups:
+                    summary[operation]["cache_hit_rate"] = (
+                        totals.get("cache_hits", 0) / lookups
+                    )
+            return summary
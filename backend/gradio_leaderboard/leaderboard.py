@@ -2,27 +2,51 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
+import sys
+import threading
+import uuid
 import warnings
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union, Literal
-
-from pandas.api.types import (
-    is_numeric_dtype,
-    is_object_dtype,
-    is_string_dtype,
-    is_bool_dtype,
-)
-import semantic_version
+import weakref
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, Union, Literal
+
+import numpy as np
 from dataclasses import dataclass, field
 
+from gradio import Request
 from gradio.components import Component
+from gradio.components.base import server
 from gradio.data_classes import GradioModel
 from gradio.events import Events
 
+from .cache import CacheInfo, LRUCache, frame_fingerprint, styler_fingerprint
+from .delta import DataframeDelta, RowSnapshot, compute_delta, snapshot
+from .encoding import EncodedColumn, decode_frame, encode_frame, restore_dtypes
+from .instrumentation import TimingEvent, Timings, payload_size
+from .parallel import query_pool
+from .query import snapshot_mask, sort_order
+from .sources import RefreshingSource, file_version, read_header, read_table
+from .store import Snapshot, store
+from .styling import StyleMetadata
+from .stats import ColumnStats, compute_filter_stats
+
 if TYPE_CHECKING:
     import pandas as pd
     from pandas.io.formats.style import Styler
 
 
+_OUT_OF_DATE = "The leaderboard value sent by the browser is out of date, please reload the page."
+
+
+def _is_styler(value: Any) -> bool:
+    # pandas' style module imports jinja2 and is slow to import, but no Styler can exist
+    # unless it was imported
+    module = sys.modules.get("pandas.io.formats.style")
+    return module is not None and isinstance(value, module.Styler)
+
+
 @dataclass
 class SearchColumns:
     primary_column: str
@@ -44,7 +68,7 @@ class SelectColumns:
 @dataclass
 class ColumnFilter:
     column: str
-    type: Literal["slider", "dropdown", "checkboxgroup", "boolean"] = None
+    type: Literal["slider", "dropdown", "checkboxgroup", "boolean", "bucket"] = None
     default: Optional[Union[int, float, List[Tuple[str, str]]]] = None
     choices: Optional[Union[int, float, List[Tuple[str, str]]]] = None
     label: Optional[str] = None
@@ -52,12 +76,18 @@ class ColumnFilter:
     show_label: bool = True
     min: Optional[Union[int, float]] = None
     max: Optional[Union[int, float]] = None
+    bins: Optional[List[Union[int, float]]] = None
 
 
 class DataframeData(GradioModel):
     headers: List[str]
     data: Union[List[List[Any]], List[Tuple[Any, ...]]]
     metadata: Optional[Dict[str, Optional[List[Any]]]] = None
+    total_rows: Optional[int] = None
+    row_offset: Optional[int] = None
+    columnar: Optional[List[EncodedColumn]] = None
+    version: Optional[str] = None
+    delta: Optional[DataframeDelta] = None
 
 
 class Leaderboard(Component):
@@ -72,7 +102,13 @@ class Leaderboard(Component):
 
     def __init__(
         self,
-        value: pd.DataFrame | None = None,
+        value: (
+            pd.DataFrame
+            | str
+            | os.PathLike
+            | Callable[[], pd.DataFrame | str | os.PathLike]
+            | None
+        ) = None,
         *,
         datatype: str | list[str] = "str",
         search_columns: list[str] | SearchColumns | None = None,
@@ -95,10 +131,19 @@ class Leaderboard(Component):
         wrap: bool = False,
         line_breaks: bool = True,
         column_widths: list[str | int] | None = None,
+        server_side: bool = False,
+        page_size: int = 100,
+        wire_format: Literal["rows", "columnar"] = "rows",
+        cache_size: int = 2,
+        delta_updates: bool = False,
+        primary_key: str | None = None,
+        lazy_columns: bool = False,
+        instrument: bool | Callable[[TimingEvent], None] = False,
+        query_workers: int = 0,
     ):
         """
         Parameters:
-            value: Default value to display in the DataFrame. Must be a pandas DataFrame.
+            value: Default value to display in the DataFrame. Must be a pandas DataFrame or the path to a CSV, Parquet or Feather file, or a function returning one of them. Files are re-read only when they change on disk.
             datatype: Datatype of values in sheet. Can be provided per column as a list of strings, or for the entire sheet as a single string. Valid datatypes are "str", "number", "bool", "date", and "markdown".
             search_columns: See Configuration section of docs for details.
             select_columns: See Configuration section of docs for details.
@@ -109,7 +154,7 @@ class Leaderboard(Component):
             latex_delimiters: A list of dicts of the form {"left": open delimiter (str), "right": close delimiter (str), "display": whether to display in newline (bool)} that will be used to render LaTeX expressions. If not provided, `latex_delimiters` is set to `[{ "left": "$$", "right": "$$", "display": True }]`, so only expressions enclosed in $$ delimiters will be rendered as LaTeX, and in a new line. Pass in an empty list to disable LaTeX rendering. For more information, see the [KaTeX documentation](https://katex.org/docs/autorender.html). Only applies to columns whose datatype is "markdown".
             label: The label for this component. Appears above the component and is also used as the header if there are a table of examples for this component. If None and used in a `gr.Interface`, the label will be the name of the parameter this component is assigned to.
             show_label: if True, will display label.
-            every: If `value` is a callable, run the function 'every' number of seconds while the client connection is open. Has no effect otherwise. The event can be accessed (e.g. to cancel it) via this component's .load_event attribute.
+            every: If `value` is a callable, run the function 'every' number of seconds in a single background thread shared by all clients. Connected clients are only sent the table when its content changed. Has no effect otherwise. The event can be accessed (e.g. to cancel it) via this component's .load_event attribute.
             height: The maximum height of the dataframe, specified in pixels if a number is passed, or in CSS units if a string is passed. If more rows are created than can fit in the height, a scrollbar will appear.
             scale: relative size compared to adjacent Components. For example if Components A and B are in a Row, and A has scale=2, and B has scale=1, A will be twice as wide as B. Should be an integer. scale applies in Rows, and to top-level Components in Blocks where fill_height=True.
             min_width: minimum pixel width, will wrap if not sufficient screen space to satisfy this value. If a certain scale value results in this Component being narrower than min_width, the min_width parameter will be respected first.
@@ -121,21 +166,49 @@ class Leaderboard(Component):
             wrap: If True, the text in table cells will wrap when appropriate. If False and the `column_width` parameter is not set, the column widths will expand based on the cell contents and the table may need to be horizontally scrolled. If `column_width` is set, then any overflow text will be hidden.
             line_breaks: If True (default), will enable Github-flavored Markdown line breaks in chatbot messages. If False, single new lines will be ignored. Only applies for columns of type "markdown."
             column_widths: An optional list representing the width of each column. The elements of the list should be in the format "100px" (ints are also accepted and converted to pixel values) or "10%". If not provided, the column widths will be automatically determined based on the content of the cells. Setting this parameter will cause the browser to try to fit the table within the page width.
+            server_side: If True, filtering, searching and column selection are evaluated on the server and only a window of `page_size` matching rows is sent to the browser at a time. Further windows are fetched as the user scrolls. Recommended for leaderboards with many thousands of rows.
+            page_size: Maximum number of rows sent to the browser per window when `server_side` is True.
+            wire_format: How the table is sent to the browser. "rows" sends a JSON list of rows. "columnar" sends each column as a base64-encoded typed array (strings are dictionary encoded), which is much cheaper to serialize and smaller for numeric-heavy leaderboards.
+            cache_size: Number of recent tables to keep, keyed by a fingerprint of their content. Re-rendering an unchanged DataFrame or Styler (e.g. when polling with `every`) reuses the cached payload instead of serializing it again. Only the serialized payload of the current table is kept; older tables keep their data, for queries and event handlers of browsers still displaying them. Tables are shared with every other Leaderboard displaying the same content, and freed once none of them keeps it. When `server_side` is True, browsers displaying a table that is no longer kept are asked to reload the page. Set to 0 to disable caching.
+            delta_updates: If True, when a new DataFrame is sent to a leaderboard that already displays a previous version of it (e.g. when polling with `every`), only the added, changed and deleted rows are sent. Rows are matched on `primary_key`. Has no effect when `server_side` is True or the value is a Styler.
+            primary_key: Column that uniquely identifies each row, used to match rows when `delta_updates` is True. Defaults to the primary search column.
+            lazy_columns: If True, only the columns in `select_columns`' default selection and those needed for searching, filtering and `primary_key` are sent to the browser. Other columns are fetched when the user selects them. Has no effect on Styler values.
+            instrument: If True, or a function called with a `TimingEvent` for every timed call, the time spent in postprocess, Styler metadata extraction, encoding, validation of the payload, preprocess and server functions is recorded along with row and column counts, serialized payload sizes and cache hits. Totals are returned by `timing_info()` and every call is logged at DEBUG level on the "gradio_leaderboard" logger. The browser also records the time spent filtering and rendering as User Timing measures.
+            query_workers: Number of worker processes that evaluate the filters and search of each query in parallel when `server_side` is True, each over its own slice of the rows of a memory-mapped copy of the table. Worker pools are shared by every Leaderboard. 0 evaluates queries in the server process. Only worthwhile for tables of several hundred thousand rows; smaller ones are always evaluated in the server process. Where processes are spawned rather than forked (macOS, Windows), `launch()` must be guarded by `if __name__ == "__main__":`.
         """
         if value is None:
             raise ValueError("Leaderboard component must have a value set.")
+        self._source: RefreshingSource | None = None
+        if callable(value):
+            self._source = RefreshingSource(value, every)
+            weakref.finalize(self, self._source.stop)
+            df, _ = self._source.get()
+            value = self._load_source
+        elif isinstance(value, (str, os.PathLike)):
+            # only the header: the initial postprocess reads the columns to send, which
+            # include the filter columns
+            df = read_header(value)
+        else:
+            df = value
         self.wrap = wrap
-        self.headers = [str(s) for s in value.columns]
+        self.headers = [str(s) for s in df.columns]
         self.datatype = datatype
         self.search_columns = self._get_search_columns(search_columns)
         self.bool_checkboxgroup_label = bool_checkboxgroup_label
-        self.select_columns_config = self._get_select_columns(select_columns, value)
-        self.filter_columns = self._get_column_filter_configs(filter_columns, value)
+        self.select_columns_config = self._get_select_columns(select_columns, df)
+        if filter_columns is not None and not isinstance(filter_columns, list):
+            raise ValueError(
+                "Columns must be a list of strings or ColumnFilter objects"
+            )
+        self._filter_column_names = self._get_filter_column_names(filter_columns)
         self.raise_error_if_incorrect_config()
+        is_file = isinstance(value, (str, os.PathLike))
+        if not is_file:
+            self.filter_columns = self._get_column_filter_configs(filter_columns, df)
 
         self.hide_columns = hide_columns or []
         self.col_count = (len(self.headers), "fixed")
-        self.row_count = (value.shape[0], "fixed")
+        self.row_count = (df.shape[0], "fixed")
 
         if latex_delimiters is None:
             latex_delimiters = [{"left": "$$", "right": "$$", "display": True}]
@@ -145,6 +218,42 @@ class Leaderboard(Component):
         self.column_widths = [
             w if isinstance(w, str) else f"{w}px" for w in (column_widths or [])
         ]
+        self.server_side = server_side
+        self.page_size = page_size
+        if wire_format not in ("rows", "columnar"):
+            raise ValueError("wire_format must be one of 'rows' or 'columnar'")
+        self.wire_format = wire_format
+        self.cache_size = cache_size
+        if not isinstance(query_workers, int) or query_workers < 0:
+            raise ValueError("query_workers must be a non-negative integer")
+        self.query_workers = query_workers if server_side else 0
+        if self.query_workers:
+            # start the workers before the server starts its threads
+            query_pool(self.query_workers)
+        self.instrument = bool(instrument)
+        self._timings: Timings | None = None
+        if instrument:
+            self._timings = Timings(instrument if callable(instrument) else None)
+        # the current table is always kept, as server functions read it
+        self._payload_cache = LRUCache(
+            max(cache_size, 1), on_evict=lambda _, snapshot: store.release(snapshot)
+        )
+        self._snapshot: Snapshot | None = None
+        # fingerprint of the last table sent to each session by _load_source
+        self._sent_to_session = LRUCache(10_000)
+        # dtypes of the tables recently sent, by version, to restore them in preprocess
+        self._sent_dtypes = LRUCache(256)
+        weakref.finalize(self, self._payload_cache.clear)
+        self.delta_updates = delta_updates
+        self.primary_key = primary_key or self.search_columns.primary_column
+        self.lazy_columns = lazy_columns
+        if delta_updates and self.primary_key not in self.headers:
+            raise ValueError(
+                "delta_updates requires a primary_key (or primary search column) that is one of the DataFrame headers."
+            )
+        self._versions: list[RowSnapshot] = []
+        self._versions_lock = threading.Lock()
+        self._last_delta: tuple[str, str, DataframeDelta | None] | None = None
         super().__init__(
             label=label,
             every=every,
@@ -158,7 +267,11 @@ class Leaderboard(Component):
             render=render,
             value=value,
         )
-    
+        if is_file:
+            df = self._snapshot.frame  # type: ignore
+            self.row_count = (df.shape[0], "fixed")
+            self.filter_columns = self._get_column_filter_configs(filter_columns, df)
+
     def raise_error_if_incorrect_config(self):
         for col in [self.search_columns.primary_column, *self.search_columns.secondary_columns]:
             if col not in self.headers:
@@ -166,25 +279,22 @@ class Leaderboard(Component):
         for col in self.select_columns_config.default_selection + self.select_columns_config.cant_deselect:
             if col not in self.headers:
                 raise ValueError(f"Column '{col}' not found in the DataFrame headers.")
-        for col in [col.column for col in self.filter_columns]:
+        for col in self._filter_column_names:
             if col not in self.headers:
                 raise ValueError(f"Column '{col}' not found in the DataFrame headers.")
 
     @staticmethod
-    def _get_best_filter_type(
-        column: str, value: pd.DataFrame
-    ) -> Literal["slider", "checkboxgroup", "dropdown", "checkbox"]:
-        if is_bool_dtype(value[column]):
-            return "checkbox"
-        if is_numeric_dtype(value[column]):
-            return "slider"
-        if is_string_dtype(value[column]) or is_object_dtype(value[column]):
-            return "checkboxgroup"
-        warnings.warn(
-            f"{column}'s type is not numeric or string, defaulting to checkboxgroup filter type.",
-            UserWarning,
-        )
-        return "checkboxgroup"
+    def _get_filter_column_names(
+        columns: list[str | ColumnFilter] | None,
+    ) -> list[str]:
+        names = []
+        for column in columns or []:
+            if not isinstance(column, (str, ColumnFilter)):
+                raise ValueError(
+                    f"Columns {column} must be a string or a ColumnFilter object"
+                )
+            names.append(column if isinstance(column, str) else column.column)
+        return names
 
     @staticmethod
     def _get_column_filter_configs(
@@ -196,34 +306,45 @@ class Leaderboard(Component):
             raise ValueError(
                 "Columns must be a list of strings or ColumnFilter objects"
             )
+        stats = compute_filter_stats(
+            value,
+            [
+                column.column if isinstance(column, ColumnFilter) else column
+                for column in columns
+                if isinstance(column, (str, ColumnFilter))
+            ],
+        )
         return [
-            Leaderboard._get_column_filter_config(column, value) for column in columns
+            Leaderboard._get_column_filter_config(column, stats) for column in columns
         ]
 
     @staticmethod
-    def _get_column_filter_config(column: str | ColumnFilter, value: pd.DataFrame):
+    def _get_column_filter_config(
+        column: str | ColumnFilter, stats: dict[str, ColumnStats]
+    ):
+        if not isinstance(column, (str, ColumnFilter)):
+            raise ValueError(
+                f"Columns {column} must be a string or a ColumnFilter object"
+            )
         column_name = column if isinstance(column, str) else column.column
-        best_filter_type = Leaderboard._get_best_filter_type(column_name, value)
-        min_val = None
-        max_val = None
+        column_stats = stats[column_name]
+        best_filter_type = column_stats.filter_type
+        min_val = column_stats.min
+        max_val = column_stats.max
         if best_filter_type == "slider":
-            default = [
-                value[column_name].quantile(0.25),
-                value[column_name].quantile(0.70),
-            ]
-            min_val = value[column_name].min()
-            max_val = value[column_name].max()
+            default = list(column_stats.default)
             choices = None
         elif best_filter_type == "checkbox":
-            default = False
+            default = column_stats.default
             choices = None
         else:
-            default = value[column_name].unique().tolist()
-            default = [(s, s) for s in default]
+            default = list(column_stats.default)
             choices = default
         if isinstance(column, ColumnFilter):
             if column.type == "boolean":
                 column.type = "checkbox"
+            if column.type == "bucket" or column.bins is not None:
+                return Leaderboard._get_bucket_filter_config(column, column_stats)
             if not column.type:
                 column.type = best_filter_type
             if column.default is None:
@@ -234,16 +355,44 @@ class Leaderboard(Component):
                 column.min = min_val
                 column.max = max_val
             return column
-        if isinstance(column, str):
-            return ColumnFilter(
-                column=column,
-                type=best_filter_type,
-                default=default,
-                choices=choices,
-                min=min_val,
-                max=max_val,
+        return ColumnFilter(
+            column=column,
+            type=best_filter_type,
+            default=default,
+            choices=choices,
+            min=min_val,
+            max=max_val,
+        )
+
+    @staticmethod
+    def _get_bucket_filter_config(
+        column: ColumnFilter, stats: ColumnStats
+    ) -> ColumnFilter:
+        """Validates the bins of a bucket filter and labels its choices.
+
+        Choices are (label, bucket index) pairs. Labels default to the right-closed
+        intervals, e.g. "(0, 2]", and can be given as a list of strings instead.
+        """
+        bins = column.bins
+        if stats.filter_type != "slider":
+            raise ValueError(f"Bucket filter column '{column.column}' must be numeric.")
+        if not bins or len(bins) < 2 or any(a >= b for a, b in zip(bins, bins[1:])):
+            raise ValueError(
+                f"Bucket filter for '{column.column}' needs at least two strictly increasing bin edges."
+            )
+        column.type = "bucket"
+        labels = column.choices or [f"({a}, {b}]" for a, b in zip(bins, bins[1:])]
+        if len(labels) != len(bins) - 1:
+            raise ValueError(
+                f"Bucket filter for '{column.column}' has {len(bins) - 1} buckets but {len(labels)} labels."
             )
-        raise ValueError(f"Columns {column} must be a string or a ColumnFilter object")
+        column.choices = [
+            (label[0], i) if isinstance(label, (list, tuple)) else (label, i)
+            for i, label in enumerate(labels)
+        ]
+        if column.default is None:
+            column.default = column.choices
+        return column
 
     @staticmethod
     def _get_search_columns(
@@ -294,12 +443,39 @@ class Leaderboard(Component):
         Returns:
             Passes the uploaded spreadsheet data as a `pandas.DataFrame`, `numpy.array`, `polars.DataFrame`, or native 2D Python `list[list]` depending on `type`
         """
+        with self._timed("preprocess") as event:
+            df = self._preprocess(payload)
+            event.rows, event.columns = df.shape
+        return df
+
+    def _preprocess(self, payload: DataframeData) -> pd.DataFrame:
         import pandas as pd
 
+        snapshot = store.get(payload.version)
+        if snapshot is not None:
+            # the table is still held by the server, with the columns that the browser
+            # was not sent
+            df = self._read_columns(snapshot, None)
+            if df is None:
+                raise ValueError(_OUT_OF_DATE)
+            return df.copy()
+        if self.server_side or payload.delta is not None:
+            # the browser only holds a window or a diff of the table. The latest table of
+            # this component may have been sent to another session, so it is not used
+            # instead
+            raise ValueError(_OUT_OF_DATE)
+        if payload.columnar is not None:
+            return restore_dtypes(
+                decode_frame(payload.headers, payload.columnar),
+                self._get_preprocess_dtypes(payload.version),
+            )
         if payload.headers is not None:
-            return pd.DataFrame(
-                [] if payload.data == [[]] else payload.data,
-                columns=payload.headers,
+            return restore_dtypes(
+                pd.DataFrame(
+                    [] if payload.data == [[]] else payload.data,
+                    columns=payload.headers,
+                ),
+                self._get_preprocess_dtypes(payload.version),
             )
         else:
             return pd.DataFrame(payload.data)
@@ -307,28 +483,52 @@ class Leaderboard(Component):
     def postprocess(self, value: pd.DataFrame) -> DataframeData:
         """
         Parameters:
-            value: Expects data any of these formats: `pandas.DataFrame`, `pandas.Styler`, `numpy.array`, `polars.DataFrame`, `list[list]`, `list`, or a `dict` with keys 'data' (and optionally 'headers'), or `str` path to a csv, which is rendered as the spreadsheet.
+            value: Expects data any of these formats: `pandas.DataFrame`, `pandas.Styler`, `numpy.array`, `polars.DataFrame`, `list[list]`, `list`, or a `dict` with keys 'data' (and optionally 'headers'), or `str` path to a CSV, Parquet or Feather file, which is rendered as the spreadsheet.
         Returns:
             the uploaded spreadsheet data as an object with `headers` and `data` attributes
         """
+        with self._timed("postprocess") as event:
+            payload = self._postprocess(value, event)
+            if self._timings is not None and self._snapshot is not None:
+                event.rows, event.columns = self._snapshot.frame.shape
+                event.bytes = payload_size(payload)
+        return payload
+
+    def _postprocess(self, value: Any, event: TimingEvent) -> DataframeData:
         import pandas as pd
-        from pandas.io.formats.style import Styler
 
         if value is None:
-            return self.postprocess(pd.DataFrame({"column 1": []}))
-        if isinstance(value, (str, pd.DataFrame)):
-            if isinstance(value, str):
-                value = pd.read_csv(value)  # type: ignore
-            if len(value) == 0:
-                return DataframeData(
-                    headers=list(value.columns),  # type: ignore
-                    data=[[]],  # type: ignore
+            return self._postprocess(pd.DataFrame({"column 1": []}), event)
+        if isinstance(value, (str, os.PathLike, pd.DataFrame)):
+            source: pd.DataFrame | tuple[str, int, int] | None = value
+            columns = None
+            if isinstance(value, (str, os.PathLike)):
+                columns = self._get_source_columns()
+                file = file_version(value)
+                if file is None:
+                    # not a local file, which cannot be read again as it was
+                    source = read_table(value)
+                    value = self._project(source, columns)
+                else:
+                    source = file
+                    value = read_table(file[0], columns)
+            elif self.lazy_columns and not self.server_side:
+                columns = self._get_needed_columns()
+                value = self._project(value, columns)
+            if columns is None:
+                source = None
+                key = self._cache_key(self._fingerprint, value)
+            else:
+                key = self._cache_key(
+                    lambda _: self._projection_key(source, columns), value  # type: ignore
                 )
-            return DataframeData(
-                headers=list(value.columns),  # type: ignore
-                data=value.to_dict(orient="split")["data"],  # type: ignore
-            )
-        elif isinstance(value, Styler):
+            payload = self._postprocess_frame(value, key, source=source, event=event)  # type: ignore
+            if self.delta_updates and not self.server_side:
+                return self._delta_payload(value, key, payload)  # type: ignore
+            return payload
+        elif _is_styler(value):
+            import semantic_version
+
             if semantic_version.Version(pd.__version__) < semantic_version.Version(
                 "1.5.0"
             ):
@@ -340,45 +540,414 @@ class Leaderboard(Component):
                     "Cannot display Styler object in interactive mode. Will display as a regular pandas dataframe instead."
                 )
             df: pd.DataFrame = value.data  # type: ignore
-            if len(df) == 0:
-                return DataframeData(
-                    headers=list(df.columns),
-                    data=[[]],
-                    metadata=self.__extract_metadata(value),  # type: ignore
-                )
+            functions: list[Callable] = []
+            return self._postprocess_frame(
+                df,
+                self._cache_key(lambda s: styler_fingerprint(s, functions), value),
+                lambda: self._timed_metadata(value),
+                event,
+                functions=functions,
+            )
+
+    def _get_needed_columns(self) -> list[str] | None:
+        """The initially displayed columns and those used for searching, filtering and
+        matching rows, or None if every column is displayed."""
+        config = self.select_columns_config
+        if not config.default_selection:
+            return None
+        needed = {
+            *config.default_selection,
+            *config.cant_deselect,
+            *self.hide_columns,
+            self.search_columns.primary_column,
+            *(self.search_columns.secondary_columns or []),
+            *self._filter_column_names,
+            self.primary_key,
+        }
+        return [h for h in self.headers if h in needed]
+
+    def _get_source_columns(self) -> list[str] | None:
+        """The columns to read from file values, or None to read all of them.
+
+        Only the needed columns are read when users cannot select other columns, or
+        when other columns are read on demand by `get_columns`.
+        """
+        if self.select_columns_config.allow and (
+            self.server_side or not self.lazy_columns
+        ):
+            return None
+        return self._get_needed_columns()
+
+    @staticmethod
+    def _project(df: pd.DataFrame, columns: list[str] | None) -> pd.DataFrame:
+        if columns is None:
+            return df
+        return df.iloc[:, [i for i, c in enumerate(df.columns) if str(c) in columns]]
+
+    def _projection_key(
+        self, source: pd.DataFrame | tuple[str, int, int], columns: list[str]
+    ) -> str:
+        """The version of the given columns of `source`. The full table is identified
+        as well, as its other columns are read by `preprocess` and `get_columns`."""
+        if isinstance(source, tuple):
+            token = "file:{}:{}:{}".format(*source)
+        else:
+            token = self._fingerprint(source)
+        digest = hashlib.blake2b(token.encode(), digest_size=16)
+        digest.update(repr(columns).encode())
+        return digest.hexdigest()
+
+    def _read_columns(
+        self, snapshot: Snapshot, columns: list[str] | None
+    ) -> pd.DataFrame | None:
+        """The given columns (default: all) of the table `snapshot` was read from, or
+        None if it was read from a file that changed since."""
+        source = snapshot.source
+        if source is None:
+            return self._project(snapshot.frame, columns)
+        if isinstance(source, tuple):
+            if file_version(source[0]) != source:
+                return None
+            return read_table(source[0], columns)
+        return self._project(source, columns)
+
+    def _get_preprocess_dtypes(self, version: str | None) -> dict[str, Any]:
+        """The dtypes of the table `version` was sent with, if it was recently sent,
+        falling back to `datatype` for others."""
+        dtypes: dict[str, Any] = {}
+        if isinstance(self.datatype, list):
+            for header, datatype in zip(self.headers, self.datatype):
+                if datatype in ("number", "bool"):
+                    dtypes[header] = np.dtype("float64" if datatype == "number" else bool)
+        dtypes.update(self._sent_dtypes.get(version) or {})
+        return dtypes
+
+    def cache_info(self) -> CacheInfo:
+        """Hits, misses, maximum and current size of the postprocessed payload cache."""
+        return self._payload_cache.info()
+
+    def timing_info(self) -> dict[str, dict[str, float]]:
+        """Calls, total, mean and max seconds, bytes sent, last row and column counts and
+        cache hit rate of every timed operation since the component was created."""
+        if self._timings is None:
+            raise ValueError(
+                "Leaderboard.timing_info is only available when the component is created with instrument=True."
+            )
+        return self._timings.summary()
+
+    def _timed(self, operation: str):
+        """Context manager timing its body as `operation` if instrumentation is on."""
+        if self._timings is None:
+            return nullcontext(TimingEvent(operation))
+        return self._timings.time(operation)
+
+    def _timed_metadata(self, styler: Styler) -> StyleMetadata:
+        with self._timed("extract_metadata") as event:
+            event.rows, event.columns = styler.data.shape  # type: ignore
+            return self.__extract_metadata(styler)
+
+    def _fingerprint(self, df: pd.DataFrame) -> str:
+        latest = self._source.latest if self._source is not None else None
+        if latest is not None and latest[0] is df:
+            return latest[1]
+        return frame_fingerprint(df)
+
+    def _load_source(self, request: Optional[Request] = None) -> Any:
+        """The load function of leaderboards whose value is a callable.
+
+        Returns the latest table loaded by the background refresher, or an empty
+        update if it was already sent to this session.
+        """
+        import gradio as gr
+
+        assert self._source is not None
+        if request is None:
+            # the initial value, loaded in __init__
+            return self._source.get()[0]
+        if self._source.interval:
+            self._source.start()
+        else:
+            # no refresher: reload on every page load as with a plain callable
+            self._source.refresh()
+        df, fingerprint = self._source.get()
+        session = getattr(request, "session_hash", None)
+        if session is not None:
+            if self._sent_to_session.get(session) == fingerprint:
+                return gr.update()
+            self._sent_to_session.put(session, fingerprint)
+        return df
+
+    def _cache_key(self, fingerprint: Callable[[Any], str | None], value: Any):
+        if self.cache_size <= 0 and not self.delta_updates:
+            return None
+        return fingerprint(value)
+
+    def _postprocess_frame(
+        self,
+        df: pd.DataFrame,
+        key: str | None,
+        get_metadata: Callable[[], StyleMetadata] | None = None,
+        event: TimingEvent | None = None,
+        source: pd.DataFrame | tuple[str, int, int] | None = None,
+        functions: list[Callable] | None = None,
+    ) -> DataframeData:
+        """Makes `df` the current table and returns its payload.
+
+        Tables are shared through the snapshot store with every other instance, so a
+        table with the same content (`key`) is only serialized once per configuration.
+        `source` is the full table if `df` only has some of its columns, and
+        `functions` those that `key` identifies by their id.
+        """
+        snapshot = self._payload_cache.get(key) if key is not None else None
+        if snapshot is None:
+            snapshot = store.acquire(
+                key or uuid.uuid4().hex, df, get_metadata, source, functions or ()
+            )
+            self._payload_cache.put(snapshot.id, snapshot)
+        previous, self._snapshot = self._snapshot, snapshot
+        if previous is not None and previous is not snapshot:
+            # its rows were sent: only the data is kept, to serve browsers displaying it
+            previous.discard(("table", self.wire_format))
+        self._sent_dtypes.put(
+            snapshot.id,
+            snapshot.derive(
+                "dtypes", lambda: {str(c): t for c, t in snapshot.frame.dtypes.items()}
+            ),
+        )
+        return self._get_payload(snapshot, event)
+
+    def _get_payload(
+        self, snapshot: Snapshot, event: TimingEvent | None = None
+    ) -> DataframeData:
+        """The payload of `snapshot`, serialized once per configuration. Whether it was
+        already serialized is recorded on `event`."""
+        if self.server_side:
+            columns = self._get_needed_columns() if self.lazy_columns else None
+            n_rows = len(snapshot.frame)
+            key = ("page", self.wire_format, self.page_size, columns and tuple(columns))
+            compute = lambda: self._get_page(
+                snapshot, np.arange(min(n_rows, self.page_size)), n_rows, 0, columns
+            )
+        else:
+            key = ("table", self.wire_format)
+            compute = lambda: self._to_data(
+                snapshot.frame,
+                metadata=snapshot.metadata and snapshot.metadata.window(),
+                version=snapshot.id,
+            )
+        if event is not None:
+            event.cache_hit = snapshot.has(key)
+        return snapshot.derive(key, compute)
+
+    def _delta_payload(
+        self, df: pd.DataFrame, version: str, payload: DataframeData
+    ) -> DataframeData:
+        """Replaces `payload` by the diff from the previous version of the table.
+
+        The last two distinct versions are remembered, so clients that are up to date or
+        one version behind can patch their rows. Others fetch the table with `get_table`.
+        """
+        with self._versions_lock:
+            if not self._versions or self._versions[-1].version != version:
+                current = snapshot(df, self.primary_key, version)  # type: ignore
+                if current is None:
+                    self._versions = []
+                    return payload
+                self._versions = [*self._versions[-1:], current]
+            if len(self._versions) < 2:
+                return payload
+            base, current = self._versions
+            if self._last_delta is None or self._last_delta[:2] != (
+                base.version,
+                version,
+            ):
+                delta = compute_delta(base, current, df, self.primary_key)  # type: ignore
+                self._last_delta = (base.version, version, delta)
+            delta = self._last_delta[2]
+        if delta is None:
+            return payload
+        return DataframeData(
+            headers=payload.headers, data=[[]], version=version, delta=delta
+        )
+
+    @server
+    def get_table(self, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Parameters:
+            payload: a dict with the `version` of the table to fetch
+        Returns:
+            that version of the table as a serialized `DataframeData`, for clients that cannot apply a delta, plus any `warnings` to display. If the server no longer holds the requested version, no rows are returned and the `version` is None.
+        """
+        if not self.delta_updates:
+            raise ValueError(
+                "Leaderboard.get_table is only available when the component is created with delta_updates=True."
+            )
+        # the component is shared by every session, so its latest table may be another
+        # session's: only the requested version is served
+        snapshot = store.get((payload or {}).get("version"))
+        if snapshot is None:
+            return {
+                **DataframeData(headers=[], data=[[]]).model_dump(),
+                "warnings": [_OUT_OF_DATE],
+            }
+        with self._timed("get_table") as event:
+            result = {**self._get_payload(snapshot).model_dump(), "warnings": []}
+            if self._timings is not None:
+                event.bytes = payload_size(result)
+        return result
+
+    @server
+    def get_columns(self, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Parameters:
+            payload: a dict with the `columns` to fetch and the `version` of the table displayed in the browser
+        Returns:
+            the requested columns of every row of that version of the table as a serialized `DataframeData`, in the order of the DataFrame. If the server no longer holds the requested version, no rows are returned and the `version` is None.
+        """
+        if not self.lazy_columns:
+            raise ValueError(
+                "Leaderboard.get_columns is only available when the component is created with lazy_columns=True."
+            )
+        columns = [str(c) for c in (payload or {}).get("columns") or []]
+        snapshot = store.get((payload or {}).get("version"))
+        df = self._read_columns(snapshot, columns) if snapshot is not None else None
+        if df is None:
+            return DataframeData(headers=[], data=[[]]).model_dump()
+        with self._timed("get_columns") as event:
+            result = self._to_data(df, version=snapshot.id).model_dump()
+            if self._timings is not None:
+                event.rows, event.columns = df.shape
+                event.bytes = payload_size(result)
+        return result
+
+    def _to_data(self, df: pd.DataFrame, **kwargs) -> DataframeData:
+        with self._timed("encode") as event:
+            event.rows, event.columns = df.shape
+            if self.wire_format == "columnar":
+                data, columnar = [[]], encode_frame(df)
+            else:
+                data = df.to_dict(orient="split")["data"] if len(df) else [[]]
+                columnar = None
+        with self._timed("validate") as event:
+            event.rows, event.columns = df.shape
             return DataframeData(
-                headers=list(df.columns),
-                data=df.to_dict(orient="split")["data"],  # type: ignore
-                metadata=self.__extract_metadata(value),  # type: ignore
+                headers=list(df.columns), data=data, columnar=columnar, **kwargs
             )
 
+    def _get_page(
+        self,
+        snapshot: Snapshot,
+        positions: np.ndarray,
+        total_rows: int,
+        row_offset: int,
+        columns: list[str] | None = None,
+    ) -> DataframeData:
+        df = snapshot.frame
+        if columns:
+            col_positions = [i for i, c in enumerate(df.columns) if str(c) in columns]
+        else:
+            col_positions = list(range(len(df.columns)))
+        page = df.iloc[positions, col_positions]
+        metadata = None
+        if snapshot.metadata is not None:
+            metadata = snapshot.metadata.window(positions, col_positions)
+        return self._to_data(
+            page,
+            metadata=metadata,
+            total_rows=total_rows,
+            row_offset=row_offset,
+            version=snapshot.id,
+        )
+
+    @staticmethod
+    def _get_sort_order(snapshot: Snapshot, column: str, direction: str) -> np.ndarray:
+        """The permutation sorting `snapshot` by `column`, computed once per snapshot."""
+        if direction not in ("asc", "des"):
+            raise ValueError(
+                f"Sort direction must be 'asc' or 'des', got '{direction}'."
+            )
+        df = snapshot.frame
+        positions = [i for i, c in enumerate(df.columns) if str(c) == column]
+        if not positions:
+            raise ValueError(f"Column '{column}' not found in the DataFrame headers.")
+        descending = direction == "des"
+        return snapshot.derive(
+            ("sort", column, descending),
+            lambda: sort_order(df.iloc[:, positions[0]], descending=descending),
+        )
+
+    @server
+    def query(self, payload: dict[str, Any] | None = None) -> dict[str, Any]:
+        """
+        Parameters:
+            payload: a dict with the `version` of the table displayed in the browser, the current `filters` (list of [column, value] pairs), `search` query, selected `columns` and optional `sort` ([column, "asc" or "des"]) of the leaderboard, and the `start` and `count` of the window of matching rows to return
+        Returns:
+            the requested window (at most `page_size` rows) of the rows matching the query as a serialized `DataframeData`, plus the total number of matching rows and any `warnings` to display. If the server no longer holds the requested version, no rows are returned and the `version` is None.
+        """
+        if not self.server_side or self._snapshot is None:
+            raise ValueError(
+                "Leaderboard.query is only available when the component is created with server_side=True."
+            )
+        with self._timed("query") as event:
+            result = self._query(payload or {})
+            event.rows = result["total_rows"]
+            event.columns = len(result["headers"])
+            if self._timings is not None:
+                event.bytes = payload_size(result)
+        return result
+
     @staticmethod
-    def __get_cell_style(cell_id: str, cell_styles: list[dict]) -> str:
-        styles_for_cell = []
-        for style in cell_styles:
-            if cell_id in style.get("selectors", []):
-                styles_for_cell.extend(style.get("props", []))
-        styles_str = "; ".join([f"{prop}: {value}" for prop, value in styles_for_cell])
-        return styles_str
+    def _get_index(payload: dict[str, Any], name: str, default: int) -> int:
+        value = payload.get(name)
+        if value is None:
+            return default
+        if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+            raise ValueError(
+                f"The `{name}` of a leaderboard query must be a non-negative integer, got {value!r}."
+            )
+        return value
+
+    def _query(self, payload: dict[str, Any]) -> dict[str, Any]:
+        # query the version displayed in this browser, which may not be the latest one.
+        # Once it is evicted, nothing else is served: the component is shared by every
+        # session, so its latest table may be another session's
+        snapshot = store.get(payload.get("version"))
+        if snapshot is None:
+            return {
+                **DataframeData(headers=[], data=[[]], total_rows=0).model_dump(),
+                "warnings": [_OUT_OF_DATE],
+            }
+        args = (
+            snapshot,
+            self.filter_columns,
+            payload.get("filters") or [],
+            self.search_columns,
+            payload.get("search"),
+        )
+        if self.query_workers:
+            mask, warnings = query_pool(self.query_workers).mask(*args)
+        else:
+            mask, warnings = snapshot_mask(*args)
+        if payload.get("sort"):
+            order = self._get_sort_order(snapshot, *payload["sort"])
+            positions = order[mask[order]]
+        else:
+            positions = np.flatnonzero(mask)
+        start = self._get_index(payload, "start", 0)
+        count = self._get_index(payload, "count", self.page_size)
+        count = max(1, min(count, self.page_size))
+        page = self._get_page(
+            snapshot,
+            positions[start : start + count],
+            len(positions),
+            start,
+            payload.get("columns"),
+        )
+        return {**page.model_dump(), "warnings": warnings}
 
     @staticmethod
-    def __extract_metadata(df: Styler) -> dict[str, list[list]]:
-        metadata = {"display_value": [], "styling": []}
-        style_data = df._compute()._translate(None, None)  # type: ignore
-        cell_styles = style_data.get("cellstyle", [])
-        for i in range(len(style_data["body"])):
-            metadata["display_value"].append([])
-            metadata["styling"].append([])
-            for j in range(len(style_data["body"][i])):
-                cell_type = style_data["body"][i][j]["type"]
-                if cell_type != "td":
-                    continue
-                display_value = style_data["body"][i][j]["display_value"]
-                cell_id = style_data["body"][i][j]["id"]
-                styles_str = Leaderboard.__get_cell_style(cell_id, cell_styles)
-                metadata["display_value"][i].append(display_value)
-                metadata["styling"][i].append(styles_str)
-        return metadata
+    def __extract_metadata(df: Styler) -> StyleMetadata:
+        return StyleMetadata(df)
 
     def process_example(
         self,
@@ -389,7 +958,10 @@ class Leaderboard(Component):
         if value is None:
             return ""
         value_df_data = self.postprocess(value)
-        value_df = pd.DataFrame(value_df_data.data, columns=value_df_data.headers)
+        if value_df_data.columnar is not None:
+            value_df = decode_frame(value_df_data.headers, value_df_data.columnar)
+        else:
+            value_df = pd.DataFrame(value_df_data.data, columns=value_df_data.headers)
         return value_df.head(n=5).to_dict(orient="split")["data"]
 
     def example_payload(self) -> Any:
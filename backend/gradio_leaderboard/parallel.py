@@ -0,0 +1,222 @@
+"""Evaluation of server-side query masks in worker processes.
+
+The table of a snapshot is written once as memory-mapped columns (in /dev/shm when
+available), and each worker evaluates filters and searches over its own slice of the
+rows. Workers map the columns instead of receiving the table, so a query only sends the
+filter and search values and gets back one bit per row.
+"""
+
+from __future__ import annotations
+
+import math
+import multiprocessing
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .cache import LRUCache
+from .query import snapshot_mask
+from .store import Snapshot
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .leaderboard import ColumnFilter, SearchColumns
+
+
+# smaller tables are not worth the round trip to the workers
+MIN_ROWS_PER_WORKER = 50_000
+
+_MANIFEST = "manifest.pkl"
+
+
+def _encode_column(series: pd.Series) -> Tuple[Optional[np.ndarray], Any]:
+    """The array written for `series` and what `_decode_column` needs to rebuild it.
+
+    Plain numpy columns are written as is. Object columns of mixed types are kept whole
+    in the manifest, as factorizing merges equal values of different types (e.g. 1 and
+    1.0). Other columns are written as `int32` codes into their distinct values. The
+    missing values of object columns keep their own object (None, NaN, ...), coded -1,
+    -2, ... in order of appearance, as filters tell them apart.
+    """
+    import pandas as pd
+    from pandas.api.types import infer_dtype
+
+    dtype = series.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+        return series.to_numpy(), None
+    if dtype == object and infer_dtype(series, skipna=True).startswith("mixed"):
+        return None, ("objects", series.to_numpy())
+    codes, uniques = pd.factorize(series)
+    codes = codes.astype(np.int32)
+    if dtype != object:
+        # extension arrays have a single missing value, restored by `take`
+        return codes, ("codes", uniques.array, None)
+    values = series.to_numpy()
+    missing_values: List[Any] = []
+    kinds: Dict[type, int] = {}
+    for i in np.flatnonzero(codes < 0):
+        kind = type(values[i])
+        if kind not in kinds:
+            kinds[kind] = len(missing_values)
+            missing_values.append(values[i])
+        codes[i] = -1 - kinds[kind]
+    return codes, ("codes", np.asarray(uniques, dtype=object), missing_values)
+
+
+def _decode_column(
+    values: Optional[np.ndarray], info: Any, start: int, stop: Optional[int]
+) -> Any:
+    if info is None:
+        return values
+    if info[0] == "objects":
+        return info[1][start:stop]
+    _, uniques, missing_values = info
+    if missing_values is None:
+        return uniques.take(values, allow_fill=True)
+    column = np.empty(len(values), dtype=object)
+    present = values >= 0
+    column[present] = uniques[values[present]]
+    column[~present] = np.asarray(missing_values, dtype=object)[-1 - values[~present]]
+    return column
+
+
+def share_frame(frame: pd.DataFrame) -> str:
+    """Writes the columns of `frame` to a new directory and returns its path."""
+    shm = "/dev/shm"
+    path = tempfile.mkdtemp(
+        prefix="gradio_leaderboard_", dir=shm if os.path.isdir(shm) else None
+    )
+    columns = []
+    for i in range(frame.shape[1]):
+        values, info = _encode_column(frame.iloc[:, i])
+        if values is not None:
+            np.save(os.path.join(path, f"{i}.npy"), values, allow_pickle=False)
+        columns.append((frame.columns[i], info))
+    with open(os.path.join(path, _MANIFEST), "wb") as f:
+        pickle.dump({"columns": columns, "n_rows": len(frame)}, f)
+    return path
+
+
+def load_frame(path: str, start: int = 0, stop: Optional[int] = None) -> pd.DataFrame:
+    """Rows `start` to `stop` of a frame written by `share_frame`, with numeric columns
+    mapped from disk rather than copied."""
+    import pandas as pd
+
+    with open(os.path.join(path, _MANIFEST), "rb") as f:
+        manifest = pickle.load(f)
+    arrays = {}
+    for i, (_, info) in enumerate(manifest["columns"]):
+        values = None
+        if info is None or info[0] == "codes":
+            values = np.load(os.path.join(path, f"{i}.npy"), mmap_mode="r")[start:stop]
+        arrays[i] = _decode_column(values, info, start, stop)
+    frame = pd.DataFrame(arrays, copy=False)
+    frame.columns = pd.Index([name for name, _ in manifest["columns"]], dtype=object)
+    return frame
+
+
+# the row slices loaded by this worker process, with their search indexes etc.
+_worker_snapshots = LRUCache(4)
+
+
+def _slice_mask(
+    path: str,
+    start: int,
+    stop: int,
+    filter_columns: Sequence[ColumnFilter],
+    filter_values: Sequence[Tuple[str, Any]],
+    search_columns: SearchColumns,
+    search_value: Optional[str],
+) -> Tuple[np.ndarray, List[str]]:
+    key = (path, start, stop)
+    snapshot = _worker_snapshots.get(key)
+    if snapshot is None:
+        snapshot = Snapshot(path, load_frame(path, start, stop))
+        _worker_snapshots.put(key, snapshot)
+    mask, warnings = snapshot_mask(
+        snapshot, filter_columns, filter_values, search_columns, search_value
+    )
+    return np.packbits(mask), warnings
+
+
+class QueryPool:
+    """Worker processes evaluating `snapshot_mask` over slices of a table.
+
+    Each worker always gets the same slice of a table, so it only maps and indexes
+    those rows. Workers are started right away, typically before the server starts its
+    threads, with the platform's default start method.
+    """
+
+    def __init__(self, workers: int):
+        context = multiprocessing.get_context()
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context)
+            for _ in range(workers)
+        ]
+        for executor in self._executors:
+            executor.submit(int)
+
+    @staticmethod
+    def _share(snapshot: Snapshot) -> str:
+        path = share_frame(snapshot.frame)
+        weakref.finalize(snapshot, shutil.rmtree, path, True)
+        return path
+
+    def mask(
+        self,
+        snapshot: Snapshot,
+        filter_columns: Sequence[ColumnFilter],
+        filter_values: Sequence[Tuple[str, Any]],
+        search_columns: SearchColumns,
+        search_value: Optional[str],
+    ) -> Tuple[np.ndarray, List[str]]:
+        """Same as `snapshot_mask`, with the rows split between the workers."""
+        n_rows = len(snapshot.frame)
+        n_slices = min(len(self._executors), math.ceil(n_rows / MIN_ROWS_PER_WORKER))
+        if n_slices <= 1:
+            return snapshot_mask(
+                snapshot, filter_columns, filter_values, search_columns, search_value
+            )
+        path = snapshot.derive("shared", lambda: self._share(snapshot))
+        bounds = np.linspace(0, n_rows, n_slices + 1).astype(int)
+        futures = [
+            executor.submit(
+                _slice_mask,
+                path,
+                int(start),
+                int(stop),
+                list(filter_columns),
+                list(filter_values),
+                search_columns,
+                search_value,
+            )
+            for executor, start, stop in zip(self._executors, bounds, bounds[1:])
+        ]
+        results = [future.result() for future in futures]
+        mask = np.concatenate(
+            [
+                np.unpackbits(bits, count=int(stop - start)).astype(bool)
+                for (bits, _), start, stop in zip(results, bounds, bounds[1:])
+            ]
+        )
+        return mask, results[0][1]
+
+
+_pools: Dict[int, QueryPool] = {}
+_pools_lock = threading.Lock()
+
+
+def query_pool(workers: int) -> QueryPool:
+    """The `QueryPool` with `workers` processes, shared by every `Leaderboard`."""
+    with _pools_lock:
+        if workers not in _pools:
+            _pools[workers] = QueryPool(workers)
+        return _pools[workers]
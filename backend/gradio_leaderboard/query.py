@@ -0,0 +1,249 @@
+"""Server-side evaluation of leaderboard filters and searches."""
+
+from __future__ import annotations
+
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .search import SearchIndex, search_index
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .leaderboard import ColumnFilter, SearchColumns
+    from .store import Snapshot
+
+
+def bucket_codes(series: pd.Series, bins: Sequence[float]) -> np.ndarray:
+    """The index of the right-closed interval of `bins` each value of `series` is in.
+
+    Values outside of the bins or missing get -1. Same as `pd.cut(series, bins,
+    labels=False)`, stored in the smallest integer type that fits.
+    """
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    codes = np.digitize(values, bins, right=True) - 1
+    codes[(codes < 0) | (codes >= len(bins) - 1) | np.isnan(values)] = -1
+    return codes.astype(np.int8 if len(bins) <= 128 else np.int32)
+
+
+def filter_mask(
+    frame: pd.DataFrame,
+    column_filter: ColumnFilter,
+    value: Any,
+    codes: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Boolean mask of the rows of `frame` that pass `column_filter` set to `value`.
+
+    Mirrors the semantics of `filter_column` in the frontend. Bucket filters use the
+    precomputed `codes` of their column if given.
+    """
+    n_rows = len(frame)
+    if column_filter.type == "checkbox" and not value:
+        return np.ones(n_rows, dtype=bool)
+    if isinstance(value, (list, tuple)) and not len(value):
+        return np.zeros(n_rows, dtype=bool)
+    if column_filter.type == "bucket":
+        if codes is None:
+            codes = bucket_codes(frame[column_filter.column], column_filter.bins)
+        return np.isin(codes, np.asarray(value, dtype=codes.dtype))
+    series = frame[column_filter.column]
+    if column_filter.type == "slider":
+        low, high = value
+        matches = (series >= low) & (series <= high)
+        if low <= 0 <= high:
+            # missing values are null in the browser, which compares null as 0
+            matches |= series.isna()
+    elif column_filter.type == "checkbox":
+        matches = series == value
+    else:
+        matches = series.isin(value)
+    return matches.to_numpy(dtype=bool, na_value=False)
+
+
+def _contains(
+    series: pd.Series, term: str, index: Optional[SearchIndex] = None
+) -> np.ndarray:
+    if index is not None:
+        return index.mask(term)
+    lowered = series.fillna("").astype(str).str.lower()
+    return lowered.str.contains(term.lower(), regex=False).to_numpy(
+        dtype=bool, na_value=False
+    )
+
+
+def search_mask(
+    frame: pd.DataFrame,
+    search_columns: SearchColumns,
+    search_value: Optional[str],
+    indexes: Optional[Mapping[str, SearchIndex]] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """Boolean mask of the rows of `frame` matching `search_value`.
+
+    Follows the search rules documented in the README: queries are separated by `;`,
+    unprefixed queries match the primary column and `column: query` matches a secondary
+    column. Like in the frontend, a row is kept if it matches ANY primary query or ALL
+    secondary queries, or ANY secondary query when there are no primary queries.
+    Columns with an entry in `indexes` are searched through their `SearchIndex`.
+    Returns the mask and the warnings that should be shown to the user.
+    """
+    n_rows = len(frame)
+    if not search_value or not search_columns.primary_column:
+        return np.ones(n_rows, dtype=bool), []
+    indexes = indexes or {}
+    warnings = []
+    primary_matches = []
+    secondary_matches = []
+    terms = [s.strip() for s in search_value.split(";") if s.strip()]
+    for term in terms:
+        column = search_columns.primary_column
+        if ":" in term:
+            column_name, _, query = term.partition(":")
+            if column_name not in (search_columns.secondary_columns or []):
+                if not warnings:
+                    warnings.append(
+                        f"Column {column_name} not found in secondary columns of search_columns"
+                    )
+                continue
+            if column_name in frame.columns:
+                column = column_name
+                term = query.strip()
+            secondary_matches.append(
+                _contains(frame[column], term, indexes.get(column))
+            )
+        else:
+            primary_matches.append(_contains(frame[column], term, indexes.get(column)))
+
+    if primary_matches and secondary_matches:
+        mask = np.logical_or.reduce(primary_matches) | np.logical_and.reduce(
+            secondary_matches
+        )
+    elif primary_matches:
+        mask = np.logical_or.reduce(primary_matches)
+    elif secondary_matches:
+        mask = np.logical_or.reduce(secondary_matches)
+    else:
+        mask = np.zeros(n_rows, dtype=bool)
+    return mask, warnings
+
+
+def sort_order(series: pd.Series, descending: bool = False) -> np.ndarray:
+    """Positions of the rows of `series` in sorted order, with missing values last.
+
+    Equal values keep their original order in both directions.
+    """
+    import pandas as pd
+
+    values = pd.Series(series.to_numpy(), copy=False)
+    try:
+        ordered = values.sort_values(
+            ascending=not descending, kind="stable", na_position="last"
+        )
+    except TypeError:
+        # mixed types that cannot be compared with each other
+        ordered = (
+            values.astype(str)
+            .where(values.notna())
+            .sort_values(ascending=not descending, kind="stable", na_position="last")
+        )
+    return ordered.index.to_numpy()
+
+
+def query_mask(
+    frame: pd.DataFrame,
+    filter_columns: Sequence[ColumnFilter],
+    filter_values: Sequence[Tuple[str, Any]],
+    search_columns: SearchColumns,
+    search_value: Optional[str],
+    indexes: Optional[Mapping[str, SearchIndex]] = None,
+    codes: Optional[Mapping[str, np.ndarray]] = None,
+) -> Tuple[np.ndarray, List[str]]:
+    """Combined mask of every active filter and the search query.
+
+    `indexes` and `codes` hold the search indexes and bucket codes of columns.
+    """
+    codes = codes or {}
+    mask, warnings = search_mask(frame, search_columns, search_value, indexes)
+    filters = {f.column: f for f in filter_columns}
+    for entry in filter_values:
+        if entry is None:
+            continue
+        column, value = entry
+        if column not in filters:
+            raise ValueError(f"Column '{column}' is not a filter column.")
+        mask &= filter_mask(frame, filters[column], value, codes.get(column))
+    return mask, warnings
+
+
+def _bucket_codes(
+    snapshot: Snapshot, filter_columns: Sequence[ColumnFilter]
+) -> Dict[str, np.ndarray]:
+    return {
+        column.column: snapshot.derive(
+            ("buckets", column.column, tuple(column.bins)),  # type: ignore
+            lambda: bucket_codes(
+                snapshot.frame[column.column], column.bins  # type: ignore
+            ),
+        )
+        for column in filter_columns
+        if column.type == "bucket"
+    }
+
+
+class _SearchIndexes(Mapping):
+    """The search indexes of the search columns of `snapshot`, each built the first
+    time a query searches its column."""
+
+    def __init__(self, snapshot: Snapshot, search_columns: SearchColumns):
+        self.snapshot = snapshot
+        self.columns = [
+            column
+            for column in [
+                search_columns.primary_column,
+                *(search_columns.secondary_columns or []),
+            ]
+            if column in snapshot.frame.columns
+        ]
+
+    def __getitem__(self, column: str) -> SearchIndex:
+        if column not in self.columns:
+            raise KeyError(column)
+        return self.snapshot.derive(
+            ("search", column), lambda: search_index(self.snapshot.frame[column])
+        )
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.columns)
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+
+def snapshot_mask(
+    snapshot: Snapshot,
+    filter_columns: Sequence[ColumnFilter],
+    filter_values: Sequence[Tuple[str, Any]],
+    search_columns: SearchColumns,
+    search_value: Optional[str],
+) -> Tuple[np.ndarray, List[str]]:
+    """`query_mask` over the frame of `snapshot`, with the search indexes and bucket
+    codes it needs computed once per snapshot."""
+    return query_mask(
+        snapshot.frame,
+        filter_columns,
+        filter_values,
+        search_columns,
+        search_value,
+        _SearchIndexes(snapshot, search_columns),
+        _bucket_codes(snapshot, filter_columns),
+    )
@@ -0,0 +1,114 @@
+"""Trigram indexes answering the substring queries of `SearchColumns`."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Dict, Optional
+
+import numpy as np
+
+from .cache import LRUCache, series_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+GRAM_SIZE = 3
+# columns with more distinct values than this fraction of their rows are scanned: the
+# index would be about as large as the column and much slower to build than a scan
+MAX_DISTINCT_FRACTION = 0.5
+
+_index_cache = LRUCache(16)
+
+
+class SearchIndex:
+    """Case-insensitive substring lookups over the values of a column.
+
+    Rows are grouped by their distinct lowercased value. When there are much fewer
+    distinct values than rows, every distinct value is indexed by the trigrams it
+    contains, and a query of at least three characters only compares the values
+    containing all of its trigrams. Other queries scan the distinct values, which is
+    still cheaper than scanning every row of a leaderboard where each model appears
+    several times.
+    """
+
+    def __init__(self, series: pd.Series):
+        import pandas as pd
+
+        lowered = series.fillna("").astype(str).str.lower()
+        codes, uniques = pd.factorize(lowered)
+        self.codes: np.ndarray = codes
+        self.values = pd.Series(np.asarray(uniques, dtype=object), dtype=object)
+        self._gram_ids: Optional[Dict[str, int]] = None
+        if len(self.values) <= MAX_DISTINCT_FRACTION * len(series):
+            self._build_postings()
+
+    def _build_postings(self) -> None:
+        """Sorts the (trigram, value) pairs by trigram into `_postings`, where the values
+        of the trigram with id `i` are `_postings[_offsets[i] : _offsets[i + 1]]`."""
+        import pandas as pd
+
+        lengths = self.values.str.len().to_numpy()
+        grams, ids = [], []
+        for start in range(max(int(lengths.max(initial=0)) - GRAM_SIZE + 1, 0)):
+            has_gram = np.flatnonzero(lengths >= start + GRAM_SIZE)
+            grams.append(
+                self.values.iloc[has_gram].str.slice(start, start + GRAM_SIZE).to_numpy()
+            )
+            ids.append(has_gram)
+        if not grams:
+            self._gram_ids, self._offsets = {}, np.zeros(1, dtype=np.int64)
+            self._postings = np.empty(0, dtype=np.int32)
+            return
+        gram_codes, gram_uniques = pd.factorize(np.concatenate(grams))
+        # a value containing a trigram several times is only listed once
+        pairs = np.sort(
+            gram_codes.astype(np.int64) * len(self.values) + np.concatenate(ids)
+        )
+        pairs = pairs[np.concatenate([[True], pairs[1:] != pairs[:-1]])]
+        self._postings = (pairs % len(self.values)).astype(np.int32)
+        counts = np.bincount(pairs // len(self.values), minlength=len(gram_uniques))
+        self._offsets = np.concatenate([[0], np.cumsum(counts)])
+        self._gram_ids = dict(zip(gram_uniques, range(len(gram_uniques))))
+
+    def _candidates(self, term: str) -> Optional[np.ndarray]:
+        """The ids of the values that may contain `term`, or None for all of them."""
+        if self._gram_ids is None or len(term) < GRAM_SIZE:
+            return None
+        postings = []
+        for start in range(len(term) - GRAM_SIZE + 1):
+            gram_id = self._gram_ids.get(term[start : start + GRAM_SIZE])
+            if gram_id is None:
+                return np.empty(0, dtype=np.int32)
+            postings.append(
+                self._postings[self._offsets[gram_id] : self._offsets[gram_id + 1]]
+            )
+        postings.sort(key=len)
+        candidates = postings[0]
+        for ids in postings[1:]:
+            if not len(candidates):
+                break
+            candidates = np.intersect1d(candidates, ids, assume_unique=True)
+        return candidates
+
+    def mask(self, term: str) -> np.ndarray:
+        """Boolean mask of the rows whose value contains `term`, ignoring case."""
+        term = term.lower()
+        candidates = self._candidates(term)
+        values = self.values if candidates is None else self.values.iloc[candidates]
+        contains = values.str.contains(term, regex=False).to_numpy(dtype=bool)
+        if candidates is None:
+            matches = contains
+        else:
+            matches = np.zeros(len(self.values), dtype=bool)
+            matches[candidates[contains]] = True
+        return matches[self.codes]
+
+
+def search_index(series: pd.Series) -> SearchIndex:
+    """The `SearchIndex` of `series`, reused for columns with the same content."""
+    key = series_fingerprint(series)
+    index = _index_cache.get(key)
+    if index is None:
+        index = SearchIndex(series)
+        _index_cache.put(key, index)
+    return index
@@ -0,0 +1,173 @@
+"""Reading leaderboards from CSV, Parquet and Feather files, and refreshing them."""
+
+from __future__ import annotations
+
+import os
+import threading
+import warnings
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, List, Optional, Tuple, Union
+
+from .cache import LRUCache, frame_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+FEATHER_SUFFIXES = (".feather", ".arrow", ".ipc")
+
+_file_cache = LRUCache(8)
+
+
+def _read_csv(path: Union[str, os.PathLike], columns: Optional[List[str]]) -> pd.DataFrame:
+    import pandas as pd
+
+    df = pd.read_csv(path, usecols=columns)
+    return df[columns] if columns is not None else df
+
+
+def _suffix(path: Union[str, os.PathLike]) -> str:
+    return Path(path).suffix.lower()
+
+
+def file_version(path: Union[str, os.PathLike]) -> Optional[Tuple[str, int, int]]:
+    """The resolved path, modification time and size of a local file, or None for URLs
+    and paths that are not an existing file."""
+    if "://" in str(path):
+        return None
+    try:
+        resolved = Path(path).resolve()
+        stat = resolved.stat()
+    except (OSError, ValueError):
+        return None
+    if not resolved.is_file():
+        return None
+    return (str(resolved), stat.st_mtime_ns, stat.st_size)
+
+
+def read_header(path: Union[str, os.PathLike]) -> pd.DataFrame:
+    """An empty DataFrame with the columns and dtypes of a CSV, Parquet or Feather/Arrow
+    IPC file, read from its schema or header line only. The schema of Parquet and
+    Feather files that are not local is read along with the whole file."""
+    import pandas as pd
+
+    suffix = _suffix(path)
+    local = file_version(path) is not None
+    if suffix in PARQUET_SUFFIXES and local:
+        import pyarrow.parquet as pq
+
+        return pq.read_schema(path).empty_table().to_pandas()
+    if suffix in FEATHER_SUFFIXES and local:
+        import pyarrow as pa
+
+        with pa.memory_map(str(path)) as source:
+            return pa.ipc.open_file(source).schema.empty_table().to_pandas()
+    if suffix in PARQUET_SUFFIXES + FEATHER_SUFFIXES:
+        return read_table(path).iloc[:0]
+    return pd.read_csv(path, nrows=0)
+
+
+def read_table(
+    path: Union[str, os.PathLike], columns: Optional[List[str]] = None
+) -> pd.DataFrame:
+    """Reads `columns` (default: all) of a CSV, Parquet or Feather/Arrow IPC file.
+
+    Parquet and Feather files only read the requested columns from disk; CSV files are
+    parsed in full, keeping only the requested columns. Local files are cached until
+    their modification time or size changes, and a cached read of every column also
+    serves reads of a subset of them. Other paths, such as URLs, are passed to pandas
+    as-is and read again every time. The returned DataFrame is shared between callers
+    and must not be modified in place.
+    """
+    import pandas as pd
+
+    file_key = file_version(path)
+    key = None
+    if file_key is not None:
+        path = file_key[0]
+        key = (*file_key, tuple(columns) if columns is not None else None)
+        df = _file_cache.get(key)
+        if df is not None:
+            return df
+        if columns is not None:
+            full = _file_cache.get((*file_key, None))
+            if full is not None:
+                df = full[columns]
+                _file_cache.put(key, df)
+                return df
+
+    suffix = _suffix(path)
+    if suffix in PARQUET_SUFFIXES:
+        df = pd.read_parquet(path, columns=columns)
+    elif suffix in FEATHER_SUFFIXES:
+        df = pd.read_feather(path, columns=columns)
+    else:
+        df = _read_csv(path, columns)
+    _file_cache.put(key, df)
+    return df
+
+
+class RefreshingSource:
+    """Runs `loader` in a single background thread every `interval` seconds.
+
+    Every client polling a leaderboard reads the latest table from here instead of
+    calling `loader` itself. `loader` may return a DataFrame or the path to a file
+    supported by `read_table`. The table and its fingerprint only change when the
+    content does, so unchanged results are not sent again. A failing load keeps the
+    previous table and emits a warning.
+    """
+
+    def __init__(self, loader: Callable[[], Any], interval: Optional[float] = None):
+        self.loader = loader
+        self.interval = interval
+        self._current: Optional[Tuple[pd.DataFrame, str]] = None
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def refresh(self) -> bool:
+        """Loads the table now. Returns whether its content changed."""
+        value = self.loader()
+        if isinstance(value, (str, os.PathLike)):
+            value = read_table(value)
+        fingerprint = frame_fingerprint(value)
+        with self._lock:
+            if self._current is not None and self._current[1] == fingerprint:
+                return False
+            self._current = (value, fingerprint)
+            return True
+
+    @property
+    def latest(self) -> Optional[Tuple[pd.DataFrame, str]]:
+        """The latest table and its fingerprint, if it was loaded."""
+        return self._current
+
+    def get(self) -> Tuple[pd.DataFrame, str]:
+        """The latest table and its fingerprint, loading it if there is none yet."""
+        if self._current is None:
+            self.refresh()
+        return self._current  # type: ignore
+
+    def start(self) -> None:
+        """Starts the background thread, if `interval` is set and it is not running."""
+        if not self.interval or self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="leaderboard-refresh", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                warnings.warn(f"Refreshing the leaderboard failed: {e!r}")
+
+    def stop(self) -> None:
+        """Stops the background thread. Called when the leaderboard it belongs to is
+        garbage collected."""
+        self._stopped.set()
@@ -0,0 +1,103 @@
+"""Filter types, defaults and choices for the columns of a leaderboard."""
+
+from __future__ import annotations
+
+import warnings
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Literal, Optional, Tuple
+
+import numpy as np
+
+from .cache import LRUCache, series_fingerprint
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+@dataclass(frozen=True)
+class ColumnStats:
+    filter_type: Literal["slider", "checkboxgroup", "checkbox"]
+    default: Any = None
+    choices: Optional[Tuple[Tuple[Any, Any], ...]] = None
+    min: Any = None
+    max: Any = None
+
+
+_slider_stats_cache = LRUCache(256)
+
+
+def best_filter_type(
+    series: pd.Series,
+) -> Literal["slider", "checkboxgroup", "checkbox"]:
+    from pandas.api.types import (
+        is_bool_dtype,
+        is_numeric_dtype,
+        is_object_dtype,
+        is_string_dtype,
+    )
+
+    if is_bool_dtype(series):
+        return "checkbox"
+    if is_numeric_dtype(series):
+        return "slider"
+    if is_string_dtype(series) or is_object_dtype(series):
+        return "checkboxgroup"
+    warnings.warn(
+        f"{series.name}'s type is not numeric or string, defaulting to checkboxgroup filter type.",
+        UserWarning,
+    )
+    return "checkboxgroup"
+
+
+def _slider_stats(series: pd.Series) -> ColumnStats:
+    key = series_fingerprint(series)
+    cached = _slider_stats_cache.get(key)
+    if cached is not None:
+        return cached
+    values = series.to_numpy(dtype="float64", na_value=np.nan)
+    missing = np.isnan(values)
+    if missing.any():
+        values = values[~missing]
+    if not len(values):
+        stats = ColumnStats("slider", default=(np.nan, np.nan), min=np.nan, max=np.nan)
+    else:
+        # both percentiles from a single selection pass instead of one sort each
+        low, high = np.quantile(values, [0.25, 0.70])
+        dtype = series.dtype
+        if not isinstance(dtype, np.dtype):
+            bounds = (series.min(), series.max())
+        elif dtype.kind in "iu":
+            raw = series.to_numpy()
+            bounds = (raw.min(), raw.max())
+        else:
+            bounds = (values.min(), values.max())
+        stats = ColumnStats("slider", default=(low, high), min=bounds[0], max=bounds[1])
+    _slider_stats_cache.put(key, stats)
+    return stats
+
+
+def compute_filter_stats(
+    value: pd.DataFrame, columns: List[str]
+) -> Dict[str, ColumnStats]:
+    """The filter type, default and choices of each of `columns`.
+
+    Slider statistics (25th/70th percentiles as default range, min/max as bounds) are
+    cached by column content, so rebuilding a leaderboard over the same data reuses
+    them. Fingerprinting a numeric column is much cheaper than computing its
+    percentiles. For other columns the unique values are cheaper to compute than a
+    fingerprint, so they are not cached.
+    """
+    stats = {}
+    for column in dict.fromkeys(columns):
+        if column not in value.columns:
+            raise ValueError(f"Column '{column}' not found in the DataFrame headers.")
+        series = value[column]
+        filter_type = best_filter_type(series)
+        if filter_type == "slider":
+            stats[column] = _slider_stats(series)
+        elif filter_type == "checkbox":
+            stats[column] = ColumnStats("checkbox", default=False)
+        else:
+            choices = tuple((s, s) for s in series.unique().tolist())
+            stats[column] = ColumnStats(filter_type, default=choices, choices=choices)
+    return stats
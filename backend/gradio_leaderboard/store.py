@@ -0,0 +1,123 @@
+"""Versioned leaderboard tables shared by every component instance and session."""
+
+from __future__ import annotations
+
+import threading
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .styling import StyleMetadata
+
+
+class Snapshot:
+    """An immutable version of a table and everything derived from it.
+
+    Serialized payloads, search indexes and sort permutations are computed at most once
+    per snapshot and shared by every `Leaderboard` displaying it, so `frame` must not
+    be modified. When `frame` only has some of the columns of the table, `source` is
+    the full table or the `file_version` of the file it was read from. `functions` are
+    kept alive for as long as the snapshot, as its id identifies them by their id.
+    """
+
+    def __init__(
+        self,
+        id: str,
+        frame: pd.DataFrame,
+        metadata: Optional[StyleMetadata] = None,
+        source: Union[pd.DataFrame, Tuple[str, int, int], None] = None,
+        functions: Sequence[Callable] = (),
+    ):
+        self.id = id
+        self.frame = frame
+        self.metadata = metadata
+        self.source = source
+        self.functions = tuple(functions)
+        self.refcount = 0
+        self._derived: Dict[Hashable, Any] = {}
+        self._lock = threading.Lock()
+
+    def derive(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """The result of `compute()`, computed once per `key` for this snapshot."""
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        # computed outside the lock, concurrent callers may both compute it
+        value = compute()
+        with self._lock:
+            return self._derived.setdefault(key, value)
+
+    def discard(self, key: Hashable) -> None:
+        """Forgets the result for `key`, which is computed again if needed."""
+        with self._lock:
+            self._derived.pop(key, None)
+
+    def has(self, key: Hashable) -> bool:
+        """Whether the result for `key` was already derived."""
+        with self._lock:
+            return key in self._derived
+
+
+class SnapshotStore:
+    """Reference-counted snapshots by ID.
+
+    Each `Leaderboard` holds a reference to the versions it recently displayed. A
+    snapshot is evicted as soon as no instance references it anymore.
+    """
+
+    def __init__(self):
+        self._snapshots: Dict[str, Snapshot] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        id: str,
+        frame: pd.DataFrame,
+        get_metadata: Optional[Callable[[], StyleMetadata]] = None,
+        source: Union[pd.DataFrame, Tuple[str, int, int], None] = None,
+        functions: Sequence[Callable] = (),
+    ) -> Snapshot:
+        """Returns a new reference to the snapshot `id`, creating it from `frame`,
+        `get_metadata`, `source` and `functions` if it is not in the store."""
+        with self._lock:
+            snapshot = self._snapshots.get(id)
+            if snapshot is not None:
+                snapshot.refcount += 1
+                return snapshot
+        snapshot = Snapshot(
+            id, frame, get_metadata() if get_metadata else None, source, functions
+        )
+        with self._lock:
+            snapshot = self._snapshots.setdefault(id, snapshot)
+            snapshot.refcount += 1
+            return snapshot
+
+    def release(self, snapshot: Snapshot) -> None:
+        with self._lock:
+            snapshot.refcount -= 1
+            if snapshot.refcount <= 0 and self._snapshots.get(snapshot.id) is snapshot:
+                del self._snapshots[snapshot.id]
+
+    def get(self, id: Optional[str]) -> Optional[Snapshot]:
+        if id is None:
+            return None
+        with self._lock:
+            return self._snapshots.get(id)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._snapshots)
+
+
+store = SnapshotStore()
@@ -0,0 +1,85 @@
+"""Display values and cell styles of pandas Stylers, extracted a window of rows at a time."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Hashable, List, Optional, Sequence
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pandas.io.formats.style import Styler
+
+
+CHUNK_SIZE = 10_000
+
+
+class StyleMetadata:
+    """The formatted values and CSS of the cells of a Styler.
+
+    Styler functions are run once over the whole table, as they may depend on every row
+    (e.g. gradients), but cells are only formatted for the rows that are sent, without
+    building the HTML render tree of `Styler._translate`. The CSS of each cell is stored
+    as an index into `palette`, the distinct CSS strings of the table, with 0 for cells
+    that are not styled.
+    """
+
+    def __init__(self, styler: Styler):
+        styler._compute()  # type: ignore
+        self.data = styler.data  # type: ignore
+        n_rows, n_cols = self.data.shape
+        self.palette: List[str] = [""]
+        ids: Dict[Hashable, int] = {(): 0}
+        styles = np.zeros((n_rows, n_cols), dtype=np.int32)
+        hidden_rows = set(styler.hidden_rows)
+        hidden_columns = set(styler.hidden_columns)
+        for (row, col), props in styler.ctx.items():  # type: ignore
+            if row in hidden_rows or col in hidden_columns:
+                continue
+            key = tuple(props)
+            if key not in ids:
+                ids[key] = len(self.palette)
+                self.palette.append("; ".join(f"{prop}: {value}" for prop, value in props))
+            styles[row, col] = ids[key]
+        self.styles = styles.astype(np.min_scalar_type(len(self.palette) - 1))
+        display_funcs = styler._display_funcs  # type: ignore
+        self._default_formatter = display_funcs.default_factory()
+        self._formatters = dict(display_funcs)
+        self._formatted_columns = {col for _, col in self._formatters}
+
+    def _format(self, rows: Sequence[int], col: int) -> List[str]:
+        values = self.data.iloc[rows, col].tolist()
+        if col not in self._formatted_columns:
+            return [self._default_formatter(value) for value in values]
+        return [
+            self._formatters.get((row, col), self._default_formatter)(value)
+            for row, value in zip(rows, values)
+        ]
+
+    def window(
+        self,
+        rows: Optional[Sequence[int]] = None,
+        columns: Optional[Sequence[int]] = None,
+    ) -> Dict[str, List[Any]]:
+        """The `display_value` and `styling` of the given rows and columns (default: all).
+
+        `styling` holds indices into the `palette` of the CSS strings used by the window.
+        Rows are formatted `CHUNK_SIZE` at a time to bound temporary memory.
+        """
+        n_rows, n_cols = self.data.shape
+        rows = np.arange(n_rows) if rows is None else np.asarray(rows, dtype=np.intp)
+        columns = list(range(n_cols)) if columns is None else list(columns)
+        styles = self.styles[np.ix_(rows, columns)]
+        used, styling = np.unique(styles, return_inverse=True)
+        styling = styling.reshape(styles.shape)
+        display_value: List[List[str]] = []
+        for start in range(0, len(rows), CHUNK_SIZE):
+            chunk = rows[start : start + CHUNK_SIZE]
+            formatted = [self._format(chunk, col) for col in columns]
+            display_value.extend(map(list, zip(*formatted)))
+        if not columns:
+            display_value = [[] for _ in rows]
+        return {
+            "display_value": display_value,
+            "styling": styling.tolist(),
+            "palette": [self.palette[i] for i in used],
+        }
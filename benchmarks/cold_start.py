@@ -0,0 +1,96 @@
+"""Benchmark the cold start of an app with many leaderboards.
+
+Reports the time to import `gradio_leaderboard` in a fresh interpreter (after Gradio
+itself, which every app imports anyway), and the time to build a `gr.Blocks` app with
+`--leaderboards` leaderboards with filter columns, as done when an app starts. With the
+default "rows" wire format, this is dominated by Gradio walking the initial payload;
+`--wire-format columnar` isolates the work done by the component itself.
+
+    python benchmarks/cold_start.py --rows 100000 --cols 50 --leaderboards 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+IMPORT_SCRIPT = """
+import sys, time
+import gradio
+before = set(sys.modules)
+start = time.perf_counter()
+import gradio_leaderboard
+print(time.perf_counter() - start)
+print(" ".join(sorted({m.split(".")[0] for m in set(sys.modules) - before})))
+"""
+
+
+def import_time(repeat: int) -> tuple[float, str]:
+    """Best time of `repeat` fresh imports and the top-level modules they loaded."""
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    timings = []
+    for _ in range(repeat):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_SCRIPT],
+            capture_output=True,
+            text=True,
+            check=True,
+            env=env,
+        ).stdout.splitlines()
+        timings.append(float(output[0]))
+    return min(timings), output[1] if len(output) > 1 else ""
+
+
+def make_frame(rows: int, cols: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    data = {
+        "model": [f"model-{i}" for i in range(rows)],
+        "type": rng.choice(["pretrained", "fine-tuned", "chat", "merge"], rows),
+        "merged": rng.random(rows) < 0.2,
+    }
+    for i in range(max(cols - len(data), 1)):
+        data[f"score_{i}"] = rng.random(rows) * 100
+    return pd.DataFrame(data)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--cols", type=int, default=50)
+    parser.add_argument("--leaderboards", type=int, default=10)
+    parser.add_argument("--filters", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--wire-format", default="rows", choices=["rows", "columnar"])
+    args = parser.parse_args()
+
+    seconds, modules = import_time(args.repeat)
+    print(f"import gradio_leaderboard {seconds * 1000:10.1f} ms")
+    print(f"  modules loaded: {modules}")
+
+    import gradio as gr
+
+    from gradio_leaderboard import Leaderboard
+
+    # a different table per leaderboard, so no statistics are shared between them
+    frames = [make_frame(args.rows, args.cols, seed) for seed in range(args.leaderboards)]
+    filter_columns = ["type", "merged", *frames[0].columns[3 : 3 + args.filters - 2]]
+    start = time.perf_counter()
+    with gr.Blocks():
+        for df in frames:
+            Leaderboard(
+                df,
+                search_columns=["model"],
+                filter_columns=list(filter_columns),
+                wire_format=args.wire_format,
+            )
+    seconds = time.perf_counter() - start
+    print(f"build app with {args.leaderboards} leaderboards {seconds * 1000:10.1f} ms")
+
+if __name__ == "__main__":
+    main()
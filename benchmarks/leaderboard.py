@@ -0,0 +1,230 @@
+"""Benchmark Leaderboard construction, postprocess, preprocess, queries and payload size.
+
+Runs headlessly over synthetic leaderboards of every combination of `--rows` and
+`--cols`, and reports the best time of `--repeat` runs and the peak memory traced during
+each step. Leaderboards use the default configuration, caches included: module caches
+are cleared and every run of a postprocess step is given a table it has not seen, while
+`postprocess_unchanged` measures the cache hit of a table sent again. Query steps run on
+a `server_side` leaderboard; `query_cold` is the first query of a new table, which
+builds its search indexes and bucket codes, and the others are repeated queries.
+
+    python benchmarks/leaderboard.py --rows 1000,10000,100000 --cols 10,50
+    python benchmarks/leaderboard.py --output results.json
+    python benchmarks/leaderboard.py --baseline results.json --max-regression 1.25
+
+With `--baseline`, the script exits with status 1 if a step is more than
+`--max-regression` times slower than in the baseline results, so it can gate releases.
+Styler steps are skipped for tables larger than `--styler-max-cells`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import orjson
+import pandas as pd
+
+from gradio_leaderboard import ColumnFilter, Leaderboard
+from gradio_leaderboard import search, sources, stats
+from gradio_leaderboard.leaderboard import DataframeData
+
+
+def make_frame(rows: int, cols: int, seed: int = 0) -> pd.DataFrame:
+    """A leaderboard with a model name, a few categorical, boolean and integer columns
+    and scores in the remaining ones."""
+    rng = np.random.default_rng(seed)
+    data = {
+        "model": [f"org{i % 997}/model-{i}" for i in range(rows)],
+        "type": rng.choice(["pretrained", "fine-tuned", "chat", "merge"], rows),
+        "precision": rng.choice(["float16", "bfloat16", "8bit", "4bit"], rows),
+        "merged": rng.random(rows) < 0.2,
+        "params": rng.integers(1, 180, rows),
+    }
+    for i in range(max(cols - len(data), 1)):
+        data[f"score_{i}"] = (rng.random(rows) * 100).round(2)
+    return pd.DataFrame(data)
+
+
+def leaderboard_kwargs() -> dict:
+    return {
+        "search_columns": ["model", "type"],
+        "filter_columns": [
+            "type",
+            "precision",
+            ColumnFilter("merged", type="boolean", default=False),
+            "params",
+            "score_0",
+        ],
+    }
+
+
+QUERIES = {
+    "query_page": {"start": 100},
+    "query_filtered": {
+        "filters": [["type", ["chat", "merge"]], ["params", [10, 50]], ["merged", True]]
+    },
+    "query_search": {"search": "model-12; type: chat"},
+    "query_search_sorted": {
+        "filters": [["precision", ["bfloat16"]], ["score_0", [10, 90]]],
+        "search": "org1",
+        "sort": ["score_0", "des"],
+    },
+}
+
+
+def clear_caches() -> None:
+    stats._slider_stats_cache.clear()
+    search._index_cache.clear()
+    sources._file_cache.clear()
+
+
+def unseen(df: pd.DataFrame, run: int) -> pd.DataFrame:
+    """A copy of `df` with a different fingerprint for every `run`."""
+    return df.assign(params=df["params"] + run + 1)
+
+
+def measure(fn, repeat: int, setup=None):
+    """Best time of `repeat` runs, peak traced memory of the first one, and result.
+
+    `setup` is called untimed before every run with the index of the run, and `fn`
+    with what it returns.
+    """
+    timings = []
+    peak = 0
+    result = None
+    for i in range(repeat):
+        clear_caches()
+        arg = setup(i) if setup is not None else None
+        if i == 0:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn(arg) if setup is not None else fn()
+        timings.append(time.perf_counter() - start)
+        if i == 0:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return min(timings), peak, result
+
+
+def run(rows: int, cols: int, args) -> dict[str, dict[str, float]]:
+    df = make_frame(rows, cols)
+    results = {}
+
+    def record(step: str, fn, setup=None):
+        seconds, peak, result = measure(fn, args.repeat, setup)
+        results[step] = {"seconds": seconds, "peak_mb": peak / 2**20}
+        return result
+
+    leaderboard = record("init", lambda: Leaderboard(df, **leaderboard_kwargs()))
+    payload = record(
+        "postprocess_dataframe",
+        leaderboard.postprocess,
+        setup=lambda run: unseen(df, run),
+    )
+    results["postprocess_dataframe"]["payload_mb"] = (
+        len(orjson.dumps(payload.model_dump(), option=orjson.OPT_SERIALIZE_NUMPY))
+        / 2**20
+    )
+    leaderboard.postprocess(df)
+    record("postprocess_unchanged", lambda: leaderboard.postprocess(df))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "leaderboard.csv")
+
+        def write(run: int) -> str:
+            unseen(df, run).to_csv(path, index=False)
+            return path
+
+        record("postprocess_csv", leaderboard.postprocess, setup=write)
+
+    # a payload sent back by the browser, whose table the server no longer holds
+    sent_back = DataframeData(**{**payload.model_dump(), "version": None})
+    record("preprocess", lambda: leaderboard.preprocess(sent_back))
+
+    server = Leaderboard(df, server_side=True, **leaderboard_kwargs())
+    first_query = QUERIES["query_search_sorted"]
+    record(
+        "query_cold",
+        lambda version: server.query({**first_query, "version": version}),
+        setup=lambda run: server.postprocess(unseen(df, run)).version,
+    )
+    version = server.postprocess(df).version
+    for step, query in QUERIES.items():
+        server.query({**query, "version": version})
+        record(step, lambda: server.query({**query, "version": version}))
+
+    if rows * cols <= args.styler_max_cells:
+        def styler(run: int):
+            return (
+                unseen(df, run)
+                .style.highlight_max(
+                    subset=[c for c in df.columns if c.startswith("score_")]
+                )
+                .format(precision=1)
+            )
+
+        extract = Leaderboard._Leaderboard__extract_metadata  # type: ignore
+        record("extract_metadata", extract, setup=styler)
+        record("postprocess_styler", leaderboard.postprocess, setup=styler)
+    return results
+
+
+def compare(results: dict, baseline: dict, max_regression: float) -> list[str]:
+    regressions = []
+    for size, steps in results.items():
+        for step, values in steps.items():
+            before = baseline.get(size, {}).get(step, {}).get("seconds")
+            # ignore noise on steps that are too fast to compare
+            if before and before > 0.01 and values["seconds"] > before * max_regression:
+                regressions.append(
+                    f"{size} {step}: {values['seconds']:.3f}s (baseline {before:.3f}s)"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="1000,10000,100000,1000000")
+    parser.add_argument("--cols", default="10,50,200")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--styler-max-cells", type=int, default=200_000)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--max-regression", type=float, default=1.25)
+    args = parser.parse_args()
+
+    # warm up lazy imports so they are not counted in the first measurements
+    run(100, 10, argparse.Namespace(repeat=1, styler_max_cells=1000))
+    results = {}
+    for rows in [int(r) for r in args.rows.split(",")]:
+        for cols in [int(c) for c in args.cols.split(",")]:
+            size = f"{rows}x{cols}"
+            results[size] = run(rows, cols, args)
+            print(size)
+            for step, values in results[size].items():
+                line = f"  {step:<24}{values['seconds']:9.3f}s {values['peak_mb']:9.1f} MB peak"
+                if "payload_mb" in values:
+                    line += f" {values['payload_mb']:9.1f} MB payload"
+                print(line, flush=True)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.max_regression)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Benchmark server-side query latency with and without query workers.
+
+Runs the same filter, search and sort queries on a `server_side` leaderboard evaluated
+in the server process (`--workers 0`) and split between worker processes, and checks
+that every configuration returns the same rows.
+
+    python benchmarks/query_workers.py --rows 2000000 --workers 0,2,4,8
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from gradio_leaderboard import ColumnFilter, Leaderboard
+
+QUERIES = [
+    {"filters": [["type", ["chat", "merge"]], ["params", [10, 50]]], "search": None},
+    {"filters": [["merged", True]], "search": "model-12", "sort": ["score", "des"]},
+    {"filters": [["score", [0, 1]]], "search": "org1/; type: chat"},
+]
+
+
+def make_frame(rows: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "model": [f"org{i % 997}/model-{i}" for i in range(rows)],
+            "type": rng.choice(["pretrained", "fine-tuned", "chat", "merge"], rows),
+            "merged": rng.random(rows) < 0.2,
+            "params": rng.integers(1, 180, rows),
+            "score": (rng.random(rows) * 100).round(2),
+        }
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=2_000_000)
+    parser.add_argument("--workers", default=f"0,{os.cpu_count()}")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    df = make_frame(args.rows)
+    print(f"{args.rows} rows, {os.cpu_count()} CPUs")
+    expected = None
+    for workers in [int(w) for w in args.workers.split(",")]:
+        leaderboard = Leaderboard(
+            df,
+            search_columns=["model", "type"],
+            filter_columns=["type", "merged", "params", ColumnFilter("score")],
+            server_side=True,
+            query_workers=workers,
+        )
+        version = leaderboard.postprocess(df).version
+        # the first queries share the table with the workers and build search indexes
+        results = [leaderboard.query({**q, "version": version}) for q in QUERIES]
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for query in QUERIES:
+                leaderboard.query({**query, "version": version})
+        seconds = (time.perf_counter() - start) / (args.repeat * len(QUERIES))
+        rows = json.dumps([(r["total_rows"], r["data"]) for r in results])
+        if expected is None:
+            expected = rows
+        assert rows == expected, f"results with {workers} workers differ"
+        print(f"  {workers:2d} workers: {seconds * 1000:8.1f} ms per query")
+
+
+if __name__ == "__main__":
+    main()
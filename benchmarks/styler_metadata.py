@@ -0,0 +1,106 @@
+"""Benchmark Styler metadata extraction on gradient-styled leaderboards.
+
+Compares the `StyleMetadata` used by `Leaderboard`, which formats cells from the
+Styler's computed context a chunk of rows at a time and stores styles as palette
+indices, against the previous approach of rendering the whole table with
+`Styler._translate` and looking up the CSS of every cell by its id.
+
+    python benchmarks/styler_metadata.py --rows 5000 --cols 30
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from gradio_leaderboard.styling import StyleMetadata
+
+
+def translate_metadata(styler) -> dict[str, list[list]]:
+    """The render-tree based extraction this benchmark compares against."""
+    n_cells = styler.data.shape[0] * styler.data.shape[1]
+    # _translate trims tables larger than this option
+    with pd.option_context("styler.render.max_elements", max(n_cells, 1)):
+        style_data = styler._compute()._translate(None, None)
+    props_by_selector: dict[str, list] = {}
+    for style in style_data.get("cellstyle", []):
+        for selector in style.get("selectors", []):
+            props_by_selector.setdefault(selector, []).extend(style.get("props", []))
+    styles_by_cell_id = {
+        selector: "; ".join([f"{prop}: {value}" for prop, value in props])
+        for selector, props in props_by_selector.items()
+    }
+    metadata = {"display_value": [], "styling": []}
+    for row in style_data["body"]:
+        cells = [cell for cell in row if cell["type"] == "td"]
+        metadata["display_value"].append([cell["display_value"] for cell in cells])
+        metadata["styling"].append(
+            [styles_by_cell_id.get(cell["id"], "") for cell in cells]
+        )
+    return metadata
+
+
+def palette_metadata(styler) -> dict[str, list]:
+    return StyleMetadata(styler).window()
+
+
+def make_styler(rows: int, cols: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame(
+        rng.random((rows, cols)) * 100, columns=[f"score_{i}" for i in range(cols)]
+    )
+    return df.style.background_gradient(cmap="Blues").format(precision=2)
+
+
+def best_of(fn, repeat: int):
+    """Best time of `repeat` runs, peak traced memory of the first one, and result."""
+    timings = []
+    peak = 0
+    for i in range(repeat):
+        if i == 0:
+            tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+        if i == 0:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+    return min(timings), peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--cols", type=int, default=30)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    styler = make_styler(args.rows, args.cols)
+    translate, translate_peak, expected = best_of(
+        lambda: translate_metadata(styler), args.repeat
+    )
+    chunked, chunked_peak, metadata = best_of(
+        lambda: palette_metadata(styler), args.repeat
+    )
+
+    palette = metadata["palette"]
+    assert metadata["display_value"] == expected["display_value"]
+    assert [[palette[i] for i in row] for row in metadata["styling"]] == expected[
+        "styling"
+    ]
+    data_mb = styler.data.memory_usage().sum() / 2**20
+    print(
+        f"{args.rows} rows x {args.cols} cols ({data_mb:.1f} MB), "
+        f"{len(palette)} distinct styles"
+    )
+    print(f"  Styler._translate: {translate:8.3f}s {translate_peak / 2**20:9.1f} MB peak")
+    print(f"  StyleMetadata:     {chunked:8.3f}s {chunked_peak / 2**20:9.1f} MB peak")
+    print(f"  speedup:           {translate / chunked:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
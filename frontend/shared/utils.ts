@@ -2,7 +2,10 @@ export type Headers = string[];
 export type Data = (string | number)[][];
 export type Datatype = "str" | "markdown" | "html" | "number" | "bool" | "date";
 export type Metadata = {
-	[key: string]: string[][] | null;
+	display_value?: string[][] | null;
+	// indices into `palette`, the distinct CSS strings of the cells
+	styling?: number[][] | null;
+	palette?: string[] | null;
 } | null;
 export type HeadersWithIDs = { value: string; id: string }[];
 export type SearchColumns = {
@@ -23,7 +26,7 @@ export type SelectColumns = {
 
 export type ColumnFilter = {
 	column: string,
-	type: "slider" | "dropdown" | "checkboxgroup" | "checkbox",
+	type: "slider" | "dropdown" | "checkboxgroup" | "checkbox" | "bucket",
 	default: boolean | number | string | [string, string][],
 	choices: [string, string][],
 	label: string | null,
@@ -32,6 +35,307 @@ export type ColumnFilter = {
 	greater_than: boolean,
 	min: number | null,
 	max: number | null,
+	bins: number[] | null,
 }
 export type FilterColumns = ColumnFilter[];
 
+export type EncodedColumn = {
+	dtype: "uint8" | "int16" | "int32" | "float32" | "float64" | "dictionary";
+	data: string;
+	categories: any[] | null;
+	decimals: number | null;
+}
+
+function base64_to_buffer(data: string): ArrayBuffer {
+	const bytes = atob(data);
+	const buffer = new Uint8Array(bytes.length);
+	for (let i = 0; i < bytes.length; i++) {
+		buffer[i] = bytes.charCodeAt(i);
+	}
+	return buffer.buffer;
+}
+
+function decode_column(column: EncodedColumn): any[] {
+	const buffer = base64_to_buffer(column.data);
+	switch (column.dtype) {
+		case "uint8":
+			return Array.from(new Uint8Array(buffer), (v) => v === 1);
+		case "int16":
+		case "int32":
+			const ints = column.dtype === "int16"
+				? new Int16Array(buffer)
+				: new Int32Array(buffer);
+			if (column.decimals === null || column.decimals === undefined) {
+				return Array.from(ints);
+			}
+			// fixed-precision numbers are sent as digits, with the smallest integer for missing
+			const missing = column.dtype === "int16" ? -32768 : -2147483648;
+			const scale = 10 ** column.decimals;
+			return Array.from(ints, (v) => (v === missing ? null : v / scale));
+		case "float32":
+		case "float64":
+			const typed = column.dtype === "float32"
+				? new Float32Array(buffer)
+				: new Float64Array(buffer);
+			// missing values are encoded as NaN, the row format sends them as null
+			return Array.from(typed, (v) => (Number.isNaN(v) ? null : v));
+		case "dictionary":
+			const categories = column.categories ?? [];
+			return Array.from(new Int32Array(buffer), (code) =>
+				code === -1 ? null : categories[code]
+			);
+	}
+}
+
+export type DataframeDelta = {
+	base_version: string;
+	key: string;
+	upserts: Data;
+	deletes: (string | number)[];
+	order: string | null;
+}
+
+export function apply_delta(rows: Data, headers: Headers, delta: DataframeDelta): Data {
+	const key_index = headers.indexOf(delta.key);
+	const deleted = new Set(delta.deletes);
+	// Map keeps insertion order, so unmatched (new) rows are appended in server order
+	const upserts = new Map(delta.upserts.map(row => [row[key_index], row]));
+	const patched: Data = [];
+	for (const row of rows) {
+		const key = row[key_index];
+		if (deleted.has(key)) continue;
+		if (upserts.has(key)) {
+			patched.push(upserts.get(key));
+			upserts.delete(key);
+		} else {
+			patched.push(row);
+		}
+	}
+	for (const row of upserts.values()) {
+		patched.push(row);
+	}
+	if (!delta.order) {
+		return patched;
+	}
+	return Array.from(new Int32Array(base64_to_buffer(delta.order)), i => patched[i]);
+}
+
+export function get_rows(value: { data: Data; columnar?: EncodedColumn[] | null }): Data {
+	if (!value.columnar) {
+		return value.data.map(s => s);
+	}
+	const columns = value.columnar.map(decode_column);
+	const n_rows = columns.length ? columns[0].length : 0;
+	const rows: Data = new Array(n_rows);
+	for (let i = 0; i < n_rows; i++) {
+		rows[i] = columns.map(column => column[i]);
+	}
+	return rows;
+}
+
+// The CSS of each cell, resolved from the palette indices sent by the backend.
+export function get_styling(metadata: Metadata): string[][] | null {
+	if (!metadata?.styling) return null;
+	const palette = metadata.palette ?? [];
+	return metadata.styling.map(row => row.map(i => palette[i] ?? ""));
+}
+
+export type QueryPayload = {
+	filters: [string, any][];
+	search: string | null;
+	columns: string[];
+	sort?: [string, "asc" | "des"] | null;
+	version?: string | null;
+	start?: number;
+	count?: number;
+}
+
+export type QueryResult = {
+	headers: Headers;
+	data: Data;
+	metadata: Metadata;
+	total_rows: number;
+	row_offset: number;
+	columnar: EncodedColumn[] | null;
+	version: string | null;
+	warnings: string[];
+}
+
+const GRAM_SIZE = 3;
+
+function grams(value: string): Set<string> {
+	const result = new Set<string>();
+	for (let i = 0; i + GRAM_SIZE <= value.length; i++) {
+		result.add(value.substring(i, i + GRAM_SIZE));
+	}
+	return result;
+}
+
+// Case-insensitive substring lookups over one column, mirroring `SearchIndex` in the
+// backend: rows are grouped by distinct lowercased value and distinct values are
+// indexed by their trigrams, so a query only compares the values that could match.
+export class SearchIndex {
+	values: string[] = [];
+	codes: Int32Array;
+	grams = new Map<string, number[]>();
+
+	constructor(rows: Data, column: number) {
+		const ids = new Map<string, number>();
+		this.codes = new Int32Array(rows.length);
+		for (let i = 0; i < rows.length; i++) {
+			const cell = rows[i][column];
+			const value = cell === null || cell === undefined ? "" : cell.toString().toLowerCase();
+			let id = ids.get(value);
+			if (id === undefined) {
+				id = this.values.length;
+				ids.set(value, id);
+				this.values.push(value);
+				for (const gram of grams(value)) {
+					const posting = this.grams.get(gram);
+					posting ? posting.push(id) : this.grams.set(gram, [id]);
+				}
+			}
+			this.codes[i] = id;
+		}
+	}
+
+	private candidates(term: string): Iterable<number> {
+		if (term.length < GRAM_SIZE) {
+			return this.values.keys();
+		}
+		const postings: number[][] = [];
+		for (const gram of grams(term)) {
+			const posting = this.grams.get(gram);
+			if (!posting) {
+				return [];
+			}
+			postings.push(posting);
+		}
+		postings.sort((a, b) => a.length - b.length);
+		// postings are sorted, since values are numbered in order of appearance
+		let candidates = postings[0];
+		for (const posting of postings.slice(1)) {
+			const common: number[] = [];
+			let j = 0;
+			for (const id of candidates) {
+				while (j < posting.length && posting[j] < id) j++;
+				if (posting[j] === id) common.push(id);
+			}
+			candidates = common;
+		}
+		return candidates;
+	}
+
+	mask(term: string): Uint8Array {
+		term = term.toLowerCase();
+		const matches = new Uint8Array(this.values.length);
+		for (const id of this.candidates(term)) {
+			matches[id] = this.values[id].includes(term) ? 1 : 0;
+		}
+		const mask = new Uint8Array(this.codes.length);
+		for (let i = 0; i < mask.length; i++) {
+			mask[i] = matches[this.codes[i]];
+		}
+		return mask;
+	}
+}
+
+// Row masks packed 32 rows per word, so that masks are cheap to keep around for every
+// filter and are combined a word at a time.
+export type Bitset = Uint32Array;
+
+export function bitset_fill(n_rows: number, value: boolean): Bitset {
+	const bits = new Uint32Array(Math.ceil(n_rows / 32));
+	if (value) {
+		bits.fill(0xffffffff);
+		if (n_rows % 32) {
+			bits[bits.length - 1] = (1 << n_rows % 32) - 1;
+		}
+	}
+	return bits;
+}
+
+export function bitset_from(n_rows: number, predicate: (i: number) => boolean): Bitset {
+	const bits = new Uint32Array(Math.ceil(n_rows / 32));
+	for (let i = 0; i < n_rows; i++) {
+		if (predicate(i)) {
+			bits[i >>> 5] |= 1 << (i & 31);
+		}
+	}
+	return bits;
+}
+
+export function bitset_and(masks: Bitset[], n_rows: number): Bitset {
+	if (!masks.length) {
+		return bitset_fill(n_rows, true);
+	}
+	const bits = masks[0].slice();
+	for (const mask of masks.slice(1)) {
+		for (let w = 0; w < bits.length; w++) {
+			bits[w] &= mask[w];
+		}
+	}
+	return bits;
+}
+
+export function bitset_select<T>(bits: Bitset, items: T[]): T[] {
+	const selected: T[] = [];
+	for (let w = 0; w < bits.length; w++) {
+		let word = bits[w];
+		while (word) {
+			const bit = 31 - Math.clz32(word & -word);
+			selected.push(items[(w << 5) + bit]);
+			word &= word - 1;
+		}
+	}
+	return selected;
+}
+
+// Calls `fn` at most once every `wait` milliseconds, always ending with the latest call.
+export function throttle<A extends any[]>(fn: (...args: A) => void, wait: number): (...args: A) => void {
+	let last = 0;
+	let timeout: ReturnType<typeof setTimeout> | null = null;
+	let pending: A | null = null;
+	return (...args: A) => {
+		pending = args;
+		if (timeout) return;
+		const delay = Math.max(0, last + wait - Date.now());
+		timeout = setTimeout(() => {
+			timeout = null;
+			last = Date.now();
+			const latest = pending as A;
+			pending = null;
+			fn(...latest);
+		}, delay);
+	};
+}
+
+// The index of the right-closed interval of `bins` each value is in, or -1 if it is in
+// none of them (same as `bucket_codes` in the backend).
+export function bucket_codes(rows: Data, column: number, bins: number[]): Int32Array {
+	const codes = new Int32Array(rows.length);
+	for (let i = 0; i < rows.length; i++) {
+		const value = rows[i][column];
+		if (typeof value !== "number" || isNaN(value) || value <= bins[0] || value > bins[bins.length - 1]) {
+			codes[i] = -1;
+			continue;
+		}
+		let low = 1;
+		let high = bins.length - 1;
+		while (low < high) {
+			const mid = (low + high) >> 1;
+			if (value <= bins[mid]) high = mid;
+			else low = mid + 1;
+		}
+		codes[i] = low - 1;
+	}
+	return codes;
+}
+
+// Records the time since `start` (from `performance.now()`) as a User Timing measure
+// named `leaderboard:<name>`, listed by `performance.getEntriesByType("measure")`.
+export function record_timing(name: string, start: number, detail?: Record<string, number>): void {
+	const end = performance.now();
+	performance.measure(`leaderboard:${name}`, { start, end, detail });
+	console.debug(`leaderboard ${name} took ${(end - start).toFixed(2)} ms`, detail ?? "");
+}
@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import Leaderboard
+from gradio_leaderboard.cache import frame_fingerprint, styler_fingerprint
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]})
+
+
+def color_red(value):
+    return "color: red"
+
+
+def test_styler_fingerprint_of_the_same_functions():
+    df = make_frame()
+    assert styler_fingerprint(df.style.map(color_red)) == styler_fingerprint(
+        df.style.map(color_red)
+    )
+    styler = df.style.map(lambda v: "color: red").format("{:.2f}", subset=["score"])
+    assert styler_fingerprint(styler) == styler_fingerprint(styler)
+
+
+def test_styler_closures_are_not_served_from_the_cache():
+    df = make_frame()
+    leaderboard = Leaderboard(df, search_columns=["model"])
+    for color in ["red", "blue", "green", "black"]:
+        payload = leaderboard.postprocess(df.style.map(lambda v: f"color: {color}"))
+        assert payload.metadata["palette"] == [f"color: {color}"]
+    assert leaderboard.cache_info().hits == 0
+    styler = df.style.map(lambda v: "color: red")
+    leaderboard.postprocess(styler)
+    leaderboard.postprocess(styler)
+    assert leaderboard.cache_info().hits == 1
+
+
+def test_styler_functions_are_kept_alive_while_cached():
+    df = make_frame()
+    leaderboard = Leaderboard(df, search_columns=["model"], cache_size=1)
+    for color in ["red", "blue", "green", "black"]:
+        payload = leaderboard.postprocess(df.style.map(lambda v: f"color: {color}"))
+        assert payload.metadata["palette"] == [f"color: {color}"]
+
+
+@pytest.mark.parametrize(
+    "other",
+    [
+        pd.DataFrame({"model": ["a", "b"], "score": [1.0, 3.0]}),
+        pd.DataFrame({"model": ["a", "b"], "average": [1.0, 2.0]}),
+        pd.DataFrame({"score": [1.0, 2.0], "model": ["a", "b"]}),
+        pd.DataFrame({"model": ["a", "b"], "score": [1, 2]}),
+        pd.DataFrame({"model": ["a", "b"], "score": ["1.0", "2.0"]}),
+        pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]}, index=[1, 0]),
+        pd.DataFrame({"model": ["a", "b"], "score": np.array([1.0, 2.0], dtype=object)}),
+    ],
+)
+def test_frame_fingerprint_differs(other):
+    assert frame_fingerprint(other) != frame_fingerprint(make_frame())
+
+
+def test_frame_fingerprint_of_object_columns():
+    numbers = pd.DataFrame({"a": pd.Series([1, 2], dtype=object)})
+    strings = pd.DataFrame({"a": pd.Series(["1", "2"], dtype=object)})
+    mixed = pd.DataFrame({"a": pd.Series([1, "2"], dtype=object)})
+    other_mixed = pd.DataFrame({"a": pd.Series(["1", 2], dtype=object)})
+    fingerprints = {frame_fingerprint(df) for df in [numbers, strings, mixed, other_mixed]}
+    assert len(fingerprints) == 4
+    lists = pd.DataFrame({"a": pd.Series([[1], [2]], dtype=object)})
+    assert frame_fingerprint(lists) == frame_fingerprint(lists.copy())
+
+
+def test_frame_fingerprint_of_equal_frames():
+    assert frame_fingerprint(make_frame()) == frame_fingerprint(make_frame())
+
+
+def color_blue(value):
+    return "color: blue"
+
+
+def test_styler_fingerprint_differs():
+    df = make_frame()
+    fingerprints = [
+        styler_fingerprint(df.style.map(color_red)),
+        styler_fingerprint(df.style.map(color_blue)),
+        styler_fingerprint(df.style.map(color_red, subset=["score"])),
+        styler_fingerprint(df.style.map(color_red).hide(["score"], axis=1)),
+        styler_fingerprint(df.style.format("{:.2f}", subset=["score"])),
+        styler_fingerprint(df.style.format("{:.1f}", subset=["score"])),
+        styler_fingerprint(df.assign(score=[1.0, 3.0]).style.map(color_red)),
+    ]
+    assert None not in fingerprints
+    assert len(set(fingerprints)) == len(fingerprints)
+
+
+def test_only_the_current_table_keeps_its_payload():
+    df = make_frame()
+    leaderboard = Leaderboard(df, search_columns=["model"])
+    assert leaderboard.cache_size == 2
+    first = leaderboard.postprocess(df)
+    snapshot = leaderboard._snapshot
+    assert snapshot.has(("table", "rows"))
+    leaderboard.postprocess(df.assign(score=[3.0, 4.0]))
+    assert not snapshot.has(("table", "rows"))
+    # the older table is still held (the first render was the value of __init__)
+    assert leaderboard.postprocess(df) == first
+    assert leaderboard.cache_info().hits == 2
+
+
+def test_snapshots_keep_only_the_styler_functions():
+    df = make_frame()
+    leaderboard = Leaderboard(df, search_columns=["model"])
+    leaderboard.postprocess(df.style.map(color_red).format("{:.1f}", subset=["score"]))
+    functions = leaderboard._snapshot.functions
+    assert color_red in functions and len(functions) == 2
+    assert not hasattr(leaderboard._snapshot, "styler")
@@ -0,0 +1,105 @@
+import base64
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard.delta import compute_delta, snapshot
+
+
+def apply_delta(rows, headers, delta):
+    """Same as `apply_delta` in the frontend."""
+    key_index = headers.index(delta.key)
+    deleted = set(delta.deletes)
+    # dicts keep insertion order, so unmatched (new) rows are appended in server order
+    upserts = {row[key_index]: row for row in delta.upserts}
+    patched = []
+    for row in rows:
+        key = row[key_index]
+        if key in deleted:
+            continue
+        patched.append(upserts.pop(key, row))
+    patched.extend(upserts.values())
+    if not delta.order:
+        return patched
+    positions = np.frombuffer(base64.b64decode(delta.order), dtype="<i4")
+    return [patched[i] for i in positions]
+
+
+def make_frame(rows: int = 10) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "model": [f"model-{i}" for i in range(rows)],
+            "score": [float(i) for i in range(rows)],
+        }
+    )
+
+
+def rows(df: pd.DataFrame) -> list:
+    return df.to_dict(orient="split")["data"]
+
+
+@pytest.mark.parametrize(
+    "change",
+    [
+        lambda df: df.assign(score=df["score"].where(df.index != 4, 100.0)),
+        lambda df: df.drop(index=[2, 7]),
+        lambda df: pd.concat([df, pd.DataFrame({"model": ["new"], "score": [1.5]})]),
+        lambda df: pd.concat(
+            [pd.DataFrame({"model": ["new"], "score": [1.5]}), df.drop(index=0)]
+        ),
+        lambda df: df.iloc[[1, 0, *range(2, len(df))]],
+        lambda df: df.sort_values("score", ascending=False).head(8).assign(
+            score=lambda d: d["score"].where(d["model"] != "model-9", -1.0)
+        ),
+    ],
+)
+def test_delta_round_trip(change):
+    old = make_frame()
+    new = change(old).reset_index(drop=True)
+    base = snapshot(old, "model", "v1")
+    current = snapshot(new, "model", "v2")
+    delta = compute_delta(base, current, new, "model", max_fraction=1)
+    assert delta is not None
+    assert delta.base_version == "v1"
+    assert apply_delta(rows(old), list(old.columns), delta) == rows(new)
+
+
+def test_delta_unchanged_rows_are_not_sent():
+    old = make_frame()
+    new = old.assign(score=old["score"].where(old.index != 4, 100.0))
+    delta = compute_delta(
+        snapshot(old, "model", "v1"), snapshot(new, "model", "v2"), new, "model"
+    )
+    assert delta.upserts == [["model-4", 100.0]]
+    assert delta.deletes == [] and delta.order is None
+
+
+def test_no_delta_when_columns_or_most_rows_change():
+    old = make_frame()
+    renamed = old.rename(columns={"score": "average"})
+    assert (
+        compute_delta(
+            snapshot(old, "model", "v1"),
+            snapshot(renamed, "model", "v2"),
+            renamed,
+            "model",
+        )
+        is None
+    )
+    changed = old.assign(score=old["score"] + 1)
+    assert (
+        compute_delta(
+            snapshot(old, "model", "v1"),
+            snapshot(changed, "model", "v2"),
+            changed,
+            "model",
+        )
+        is None
+    )
+
+
+def test_snapshot_needs_a_unique_key():
+    df = make_frame()
+    assert snapshot(df, "missing", "v1") is None
+    assert snapshot(pd.concat([df, df]), "model", "v1") is None
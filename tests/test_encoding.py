@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard.encoding import (
+    decode_column,
+    decode_frame,
+    encode_column,
+    encode_frame,
+    restore_dtypes,
+)
+
+
+def test_restore_dtypes_casts_values_that_fit():
+    df = pd.DataFrame(
+        {"type": ["a", "b", None], "params": [1, 2, 3], "date": ["2024-01-01"] * 3}
+    )
+    dtypes = {
+        "type": pd.CategoricalDtype(["a", "b"]),
+        "params": np.dtype("int64"),
+        "date": np.dtype("datetime64[ns]"),
+    }
+    restored = restore_dtypes(df, dtypes)
+    assert [str(t) for t in restored.dtypes] == ["category", "int64", "datetime64[ns]"]
+    assert restored["type"].isna().sum() == 1
+
+
+def test_restore_dtypes_keeps_columns_that_do_not_fit():
+    df = pd.DataFrame({"type": ["a", "merge"], "params": [1.0, np.nan], "x": ["1", "y"]})
+    dtypes = {
+        "type": pd.CategoricalDtype(["a", "b"]),
+        "params": np.dtype("int64"),
+        "x": np.dtype("float64"),
+    }
+    restored = restore_dtypes(df, dtypes)
+    pd.testing.assert_frame_equal(restored, df)
+
+
+def test_restore_dtypes_with_repeated_headers():
+    df = pd.DataFrame([[1, "2"]], columns=["a", "a"])
+    restored = restore_dtypes(df, {"a": np.dtype("float64")})
+    assert restored.columns.tolist() == ["a", "a"]
+    assert restored.dtypes.tolist() == [np.dtype("float64")] * 2
+
+
+def roundtrip(series: pd.Series) -> np.ndarray:
+    return decode_column(encode_column(series))
+
+
+@pytest.mark.parametrize(
+    "series, dtype",
+    [
+        (pd.Series([True, False, True]), "uint8"),
+        (pd.Series([1, -2, 3]), "int32"),
+        (pd.Series([2.0**-10, 1.25, -2.0]), "float32"),
+        (pd.Series([0.1, 1 / 3]), "float64"),
+        (pd.Series([1, 2**40]), "float32"),
+        (pd.Series([1, 2**40 + 1]), "float64"),
+    ],
+)
+def test_encode_numeric_columns(series, dtype):
+    column = encode_column(series)
+    assert column.dtype == dtype
+    np.testing.assert_array_equal(decode_column(column), series.to_numpy())
+
+
+def test_encode_missing_numbers_as_nan():
+    decoded = roundtrip(pd.Series([1, None, 3], dtype="Int64"))
+    np.testing.assert_array_equal(decoded, [1.0, np.nan, 3.0])
+    # booleans with missing values are dictionary encoded
+    assert list(roundtrip(pd.Series([True, None], dtype="boolean"))) == [True, None]
+
+
+def test_encode_dictionary_columns():
+    series = pd.Series(["a", None, "b", "a"], dtype=object)
+    column = encode_column(series)
+    assert column.dtype == "dictionary"
+    assert column.categories == ["a", "b"]
+    assert list(decode_column(column)) == ["a", None, "b", "a"]
+
+
+def test_encode_unhashable_values():
+    series = pd.Series([[1, 2], [3]], dtype=object)
+    assert list(roundtrip(series)) == [[1, 2], [3]]
+
+
+def test_decode_frame_keeps_repeated_headers():
+    df = pd.DataFrame([[1, "x"], [2, "y"]], columns=["a", "a"])
+    decoded = decode_frame(["a", "a"], encode_frame(df))
+    assert decoded.columns.tolist() == ["a", "a"]
+    assert decoded.iloc[:, 1].tolist() == ["x", "y"]
+
+
+@pytest.mark.parametrize(
+    "values, dtype, decimals",
+    [
+        ([12.34, 0.1, -99.99, 100.0], "int16", 2),
+        ([0.5, 1.25, -2.0], "int16", 2),
+        ([1.0, 2.0, np.nan], "int16", 0),
+        ([123456.7, 0.1], "int32", 1),
+        ([0.123456, 1e-6], "int32", 6),
+    ],
+)
+def test_encode_fixed_precision_numbers_as_digits(values, dtype, decimals):
+    series = pd.Series(values)
+    column = encode_column(series)
+    assert (column.dtype, column.decimals) == (dtype, decimals)
+    np.testing.assert_array_equal(decode_column(column), series.to_numpy())
+
+
+def test_encode_numbers_with_more_decimals_as_floats():
+    assert encode_column(pd.Series([0.1234567, 1.0])).dtype == "float64"
+    assert encode_column(pd.Series([0.1, np.inf])).dtype == "float64"
+    # float32 is as small as int32 digits
+    assert encode_column(pd.Series([0.5, 100000.25])).dtype == "float32"
@@ -0,0 +1,49 @@
+import pandas as pd
+
+from gradio_leaderboard import Leaderboard, SelectColumns
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {"model": ["a", "b", "c"], "score": [1.0, 2.0, 3.0], "notes": ["x", "y", "z"]}
+    )
+
+
+def test_timed_operations():
+    df = make_frame()
+    events = []
+    leaderboard = Leaderboard(
+        df,
+        search_columns=["model"],
+        select_columns=SelectColumns(default_selection=["model", "score"]),
+        lazy_columns=True,
+        server_side=True,
+        delta_updates=True,
+        instrument=events.append,
+    )
+    payload = leaderboard.postprocess(df)
+    leaderboard.postprocess(df)
+    leaderboard.postprocess(df.style.highlight_max(subset=["score"]))
+    leaderboard.preprocess(payload)
+    leaderboard.query({"version": payload.version, "search": "a"})
+    leaderboard.get_table({"version": payload.version})
+    leaderboard.get_columns({"version": payload.version, "columns": ["notes"]})
+
+    info = leaderboard.timing_info()
+    assert set(info) == {
+        "postprocess",
+        "extract_metadata",
+        "encode",
+        "validate",
+        "preprocess",
+        "query",
+        "get_table",
+        "get_columns",
+    }
+    assert info["postprocess"]["cache_hits"] >= 1
+    assert info["postprocess"]["cache_misses"] >= 1
+    assert info["postprocess"]["calls"] == sum(
+        e.operation == "postprocess" for e in events
+    )
+    assert info["query"]["rows"] == 1
+    assert all(e.seconds >= 0 for e in events)
@@ -0,0 +1,278 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import ColumnFilter, Leaderboard, SearchColumns, SelectColumns
+
+
+def make_frame(rows: int = 10) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "model": [f"model-{i}" for i in range(rows)],
+            "s1": [float(i) for i in range(rows)],
+            "s2": list(range(rows)),
+            "s3": [f"note {i}" for i in range(rows)],
+        }
+    )
+
+
+def lazy_leaderboard(df: pd.DataFrame, **kwargs) -> Leaderboard:
+    return Leaderboard(
+        df,
+        search_columns=["model"],
+        select_columns=SelectColumns(default_selection=["model", "s1"]),
+        lazy_columns=True,
+        **kwargs,
+    )
+
+
+def test_lazy_columns_preprocess_every_column_of_each_version():
+    df = make_frame()
+    leaderboard = lazy_leaderboard(df)
+    first = leaderboard.postprocess(df)
+    assert first.headers == ["model", "s1"]
+    second = leaderboard.postprocess(df.assign(s2=df["s2"] * 2))
+    pd.testing.assert_frame_equal(leaderboard.preprocess(first), df)
+    assert leaderboard.preprocess(second)["s2"].tolist() == (df["s2"] * 2).tolist()
+
+
+def test_lazy_columns_preprocess_deltas_with_every_column():
+    df = make_frame()
+    leaderboard = lazy_leaderboard(df, delta_updates=True)
+    leaderboard.postprocess(df)
+    changed = df.assign(s1=df["s1"].where(df.index != 3, 100.0))
+    payload = leaderboard.postprocess(changed)
+    assert payload.delta is not None
+    pd.testing.assert_frame_equal(leaderboard.preprocess(payload), changed)
+
+
+def test_lazy_columns_versions_differ_in_unsent_columns():
+    df = make_frame()
+    leaderboard = lazy_leaderboard(df)
+    first = leaderboard.postprocess(df)
+    second = leaderboard.postprocess(df.assign(s3="changed"))
+    assert first.version != second.version
+    result = leaderboard.get_columns({"columns": ["s3", "s2"], "version": first.version})
+    assert result["headers"] == ["s2", "s3"]
+    assert result["data"][0] == [0, "note 0"]
+    missing = leaderboard.get_columns({"columns": ["s3"], "version": "unknown"})
+    assert missing["version"] is None
+
+
+def test_lazy_columns_file_changed_since_version(tmp_path):
+    path = tmp_path / "leaderboard.csv"
+    make_frame().to_csv(path, index=False)
+    leaderboard = lazy_leaderboard(str(path))
+    payload = leaderboard.postprocess(str(path))
+    pd.testing.assert_frame_equal(leaderboard.preprocess(payload), make_frame())
+    make_frame(5).to_csv(path, index=False)
+    with pytest.raises(ValueError, match="out of date"):
+        leaderboard.preprocess(payload)
+
+
+def test_preprocess_restores_dtypes_of_the_version_sent():
+    first = pd.DataFrame(
+        {"model": ["a", "b"], "type": pd.Categorical(["merge", "base"])}
+    )
+    second = pd.DataFrame({"model": ["a", "b"], "type": pd.Categorical(["base", "base"])})
+    leaderboard = Leaderboard(first, search_columns=["model"], cache_size=1)
+    payload = leaderboard.postprocess(first).model_copy()
+    leaderboard.postprocess(second)
+    pd.testing.assert_frame_equal(leaderboard.preprocess(payload), first)
+    # a version the server knows nothing about keeps the inferred dtypes
+    payload.version = "unknown"
+    df = leaderboard.preprocess(payload)
+    assert df["type"].tolist() == ["merge", "base"]
+    assert not isinstance(df["type"].dtype, pd.CategoricalDtype)
+
+
+def test_get_table_serves_only_the_requested_version():
+    df = make_frame()
+    leaderboard = Leaderboard(df, search_columns=["model"], delta_updates=True)
+    first = leaderboard.postprocess(df)
+    second = leaderboard.postprocess(df.assign(s1=df["s1"].where(df.index != 3, 100.0)))
+    assert second.delta is not None
+    table = leaderboard.get_table({"version": second.version})
+    assert table["version"] == second.version
+    assert table["data"][3][1] == 100.0
+    assert leaderboard.get_table({"version": first.version})["data"][3][1] == 3.0
+    missing = leaderboard.get_table({"version": "unknown"})
+    assert missing["version"] is None and missing["data"] == [[]]
+    assert missing["warnings"]
+
+
+def test_query_pages_are_at_most_page_size():
+    df = make_frame(1000)
+    leaderboard = Leaderboard(
+        df, search_columns=["model"], server_side=True, page_size=10
+    )
+    version = leaderboard.postprocess(df).version
+    query = lambda **kwargs: leaderboard.query({"version": version, **kwargs})
+    assert len(query()["data"]) == 10
+    assert len(query(count=1000)["data"]) == 10
+    assert len(query(count=3)["data"]) == 3
+    page = query(start=995, count=10)
+    assert page["row_offset"] == 995 and len(page["data"]) == 5
+    for bad in [{"count": -1}, {"count": 2.5}, {"start": -10}, {"start": "1"}]:
+        with pytest.raises(ValueError, match="non-negative integer"):
+            query(**bad)
+
+
+def frontend_filter(rows, headers, filter_columns, filter_values, search_columns, search):
+    """The rows the baseline frontend shows, mirroring `filter_column_values` and
+    `search_column_values` in Index.svelte."""
+
+    def matches_filter(row, column, value):
+        cell = row[headers.index(column.column)]
+        if column.type == "checkbox":
+            return not value or cell is value
+        if isinstance(value, list) and not value:
+            return False
+        if column.type == "slider":
+            low, high = value
+            # null compares as 0 in javascript
+            cell = 0 if cell is None else cell
+            return low <= cell <= high
+        return cell in value
+
+    def matches_search(row):
+        if not search:
+            return True
+        primary, secondary = [], []
+        for query in [s.strip() for s in search.split(";") if s.strip()]:
+            index = headers.index(search_columns.primary_column)
+            name, colon, rest = query.partition(":")
+            if colon:
+                if name not in search_columns.secondary_columns:
+                    continue
+                if name in headers:
+                    index, query = headers.index(name), rest.strip()
+            cell = "" if row[index] is None else str(row[index])
+            (secondary if colon else primary).append(query.lower() in cell.lower())
+        if primary and not secondary:
+            return any(primary)
+        if secondary and not primary:
+            return any(secondary)
+        return bool(primary) and (any(primary) or all(secondary))
+
+    columns = {c.column: c for c in filter_columns}
+    return [
+        row
+        for row in rows
+        if matches_search(row)
+        and all(matches_filter(row, columns[c], v) for c, v in filter_values)
+    ]
+
+
+def parity_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    rows = 500
+    scores = rng.uniform(0, 100, rows).round(1)
+    scores[rng.random(rows) < 0.1] = np.nan
+    return pd.DataFrame(
+        {
+            "model": [f"Org{i % 13}/Model-{i}" for i in range(rows)],
+            "type": rng.choice(["base", "chat", "merge", "fine-tuned"], rows),
+            "merged": rng.random(rows) < 0.3,
+            "params": rng.integers(1, 70, rows),
+            "score": scores,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "filters, search",
+    [
+        ([], None),
+        ([["type", ["chat", "merge"]]], None),
+        ([["type", []]], None),
+        ([["merged", True]], None),
+        ([["merged", False]], None),
+        ([["params", [10, 30]]], None),
+        # missing scores pass a slider whose range contains 0
+        ([["score", [0, 50]]], None),
+        ([["score", [20, 50]]], None),
+        ([], "org1/"),
+        ([], "MODEL-4; model-12"),
+        ([], "type: chat"),
+        ([], "type: chat; type: merge"),
+        ([], "org3; type: base"),
+        ([], "size: 7; org3"),
+        ([["type", ["base"]], ["params", [5, 60]], ["merged", True]], "org1"),
+    ],
+)
+def test_query_matches_the_frontend(filters, search):
+    df = parity_frame()
+    leaderboard = Leaderboard(
+        df,
+        search_columns=SearchColumns(primary_column="model", secondary_columns=["type"]),
+        filter_columns=["type", ColumnFilter("merged", type="boolean"), "params", "score"],
+        server_side=True,
+        page_size=1000,
+    )
+    version = leaderboard.postprocess(df).version
+    result = leaderboard.query({"version": version, "filters": filters, "search": search})
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    expected = frontend_filter(
+        rows,
+        df.columns.tolist(),
+        leaderboard.filter_columns,
+        filters,
+        leaderboard.search_columns,
+        search,
+    )
+    assert result["total_rows"] == len(expected)
+    # a page without rows is sent as [[]]
+    assert [row[0] for row in result["data"] if row] == [row[0] for row in expected]
+
+
+@pytest.mark.parametrize("direction", ["asc", "des"])
+def test_query_sorts_and_pages_the_matching_rows(direction):
+    df = parity_frame()
+    leaderboard = Leaderboard(
+        df,
+        search_columns=["model"],
+        filter_columns=["type"],
+        server_side=True,
+        page_size=20,
+    )
+    version = leaderboard.postprocess(df).version
+    matching = df[df["type"] == "chat"]
+    expected = matching.sort_values(
+        "score", ascending=direction == "asc", kind="stable", na_position="last"
+    )["model"].tolist()
+    models = []
+    for start in range(0, len(matching) + 20, 20):
+        page = leaderboard.query(
+            {
+                "version": version,
+                "filters": [["type", ["chat"]]],
+                "sort": ["score", direction],
+                "start": start,
+            }
+        )
+        assert page["total_rows"] == len(matching)
+        assert page["row_offset"] == start
+        models += [row[0] for row in page["data"] if row]
+    assert models == expected
+
+
+def test_server_functions_of_an_evicted_version():
+    df = make_frame()
+    leaderboard = Leaderboard(
+        df,
+        search_columns=["model"],
+        select_columns=SelectColumns(default_selection=["model", "s1"]),
+        lazy_columns=True,
+        server_side=True,
+        delta_updates=True,
+        cache_size=1,
+    )
+    stale = leaderboard.postprocess(df).version
+    for i in range(3):
+        leaderboard.postprocess(df.assign(s1=df["s1"] + i + 1))
+    assert leaderboard.query({"version": stale})["warnings"]
+    table = leaderboard.get_table({"version": stale})
+    assert table["version"] is None and table["warnings"]
+    columns = leaderboard.get_columns({"version": stale, "columns": ["s2"]})
+    assert columns["version"] is None and columns["data"] == [[]]
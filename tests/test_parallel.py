@@ -0,0 +1,84 @@
+import json
+import shutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import ColumnFilter, Leaderboard, parallel
+from gradio_leaderboard.parallel import load_frame, share_frame
+
+
+def make_frame(rows: int = 100) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    types = rng.choice(["a", "b", "c"], rows).astype(object)
+    types[rng.random(rows) < 0.2] = None
+    types[rng.random(rows) < 0.1] = np.nan
+    category = pd.Categorical(rng.choice(["x", "y"], rows), categories=["x", "y", "z"])
+    category[rng.random(rows) < 0.2] = np.nan
+    params = pd.array(rng.integers(1, 100, rows), dtype="Int64")
+    params[rng.random(rows) < 0.2] = pd.NA
+    mixed = np.array([[1, "1", 1.0, None][i % 4] for i in range(rows)], dtype=object)
+    return pd.DataFrame(
+        {
+            "model": [f"model-{i}" for i in range(rows)],
+            "type": types,
+            "category": category,
+            "params": params,
+            "mixed": mixed,
+            "merged": rng.random(rows) < 0.3,
+            "score": (rng.random(rows) * 100).round(2),
+        }
+    )
+
+
+def test_load_frame_restores_missing_values():
+    df = make_frame()
+    path = share_frame(df)
+    try:
+        frame = load_frame(path, 10, 60).copy()
+    finally:
+        shutil.rmtree(path)
+    expected = df.iloc[10:60].reset_index(drop=True)
+    pd.testing.assert_frame_equal(frame, expected)
+    for column in ["type", "mixed"]:
+        assert [type(v) for v in frame[column]] == [type(v) for v in expected[column]]
+
+
+@pytest.mark.parametrize(
+    "filters, search",
+    [
+        (None, None),
+        ([["type", [None, "a"]]], None),
+        ([["type", [[None, None], ["b", "b"]]]], "model-1"),
+        ([["category", ["y"]], ["params", [10, 60]]], None),
+        ([["merged", True], ["score", [20, 80]]], "type: a"),
+    ],
+)
+def test_query_workers_match_in_process_queries(monkeypatch, filters, search):
+    monkeypatch.setattr(parallel, "MIN_ROWS_PER_WORKER", 10)
+    df = make_frame()
+    kwargs = {
+        "search_columns": ["model", "type"],
+        "filter_columns": [
+            "type",
+            "category",
+            "params",
+            ColumnFilter("merged", type="boolean"),
+            "score",
+        ],
+        "server_side": True,
+        "page_size": len(df),
+    }
+    results = []
+    for workers in [0, 2]:
+        leaderboard = Leaderboard(df, query_workers=workers, **kwargs)
+        if filters is None:
+            # the default state of every filter
+            filters = [[f.column, f.default] for f in leaderboard.filter_columns]
+        version = leaderboard.postprocess(df).version
+        result = leaderboard.query(
+            {"version": version, "filters": filters, "search": search}
+        )
+        results.append(json.dumps([result["total_rows"], result["data"]]))
+    assert results[0] == results[1]
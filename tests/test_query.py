@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import SearchColumns
+from gradio_leaderboard.query import bucket_codes, search_mask, snapshot_mask
+from gradio_leaderboard.search import SearchIndex
+from gradio_leaderboard.store import Snapshot
+
+
+def make_frame() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "name": ["Maria", "Mario", "Jose", "Ana", None],
+            "country": ["Spain", "Italy", "Spain", "Brazil", "Italy"],
+            "team": ["red", "blue", "blue", "red", "red"],
+        }
+    )
+
+
+SEARCH_COLUMNS = SearchColumns(primary_column="name", secondary_columns=["country", "team"])
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        (None, [True] * 5),
+        ("", [True] * 5),
+        # matched against the primary column, ignoring case
+        ("mari", [True, True, False, False, False]),
+        # ANY of the primary queries
+        ("maria; ana", [True, False, False, True, False]),
+        # a secondary column is searched by prefixing the query with its name
+        ("country: spain", [True, False, True, False, False]),
+        # ANY primary query or ALL secondary queries
+        ("ana; country: spain; team: blue", [False, False, True, True, False]),
+        ("jose; country: italy; team: red", [False, False, True, False, True]),
+    ],
+)
+def test_search_mask(query, expected):
+    df = make_frame()
+    mask, warnings = search_mask(df, SEARCH_COLUMNS, query)
+    assert mask.tolist() == expected
+    assert warnings == []
+    indexes = {column: SearchIndex(df[column]) for column in df.columns}
+    assert search_mask(df, SEARCH_COLUMNS, query, indexes)[0].tolist() == expected
+
+
+def test_search_mask_secondary_queries_only():
+    # like the frontend, secondary queries on their own match ANY of them
+    mask, _ = search_mask(make_frame(), SEARCH_COLUMNS, "country: brazil; team: blue")
+    assert mask.tolist() == [False, True, True, True, False]
+
+
+def test_search_mask_warns_about_unknown_columns():
+    mask, warnings = search_mask(make_frame(), SEARCH_COLUMNS, "city: rome; ana")
+    assert mask.tolist() == [False, False, False, True, False]
+    assert warnings == ["Column city not found in secondary columns of search_columns"]
+
+
+@pytest.mark.parametrize(
+    "bins", [[0, 10, 50, 100], [-1.5, 0, 0.5], list(range(0, 101, 1))]
+)
+def test_bucket_codes_match_pd_cut(bins):
+    rng = np.random.default_rng(0)
+    values = pd.Series(rng.uniform(-5, 110, 500))
+    values[rng.random(500) < 0.1] = np.nan
+    values[:len(bins)] = bins
+    expected = pd.cut(values, bins, labels=False).fillna(-1).astype(int)
+    assert bucket_codes(values, bins).tolist() == expected.tolist()
+
+
+def test_bucket_codes_of_nullable_integers():
+    values = pd.Series([0, 1, 5, None, 11], dtype="Int64")
+    assert bucket_codes(values, [0, 5, 10]).tolist() == [-1, 0, 0, -1, -1]
+
+
+def test_search_index_postings_match_a_scan():
+    rng = np.random.default_rng(0)
+    names = [f"Org-{i % 7}/Model-{i}-{'x' * (i % 5)}" for i in range(40)]
+    series = pd.Series(rng.choice(names + [None], 400))
+    index = SearchIndex(series)
+    assert index._gram_ids is not None
+    scan = series.fillna("").str.lower()
+    for term in ["org-3", "MODEL-1", "-xx", "l-3", "zz", "x", "org-3/model-10-", "no match"]:
+        expected = scan.str.contains(term.lower(), regex=False).to_numpy()
+        assert index.mask(term).tolist() == expected.tolist()
+
+
+def test_search_index_scans_mostly_distinct_columns():
+    index = SearchIndex(pd.Series([f"model-{i}" for i in range(100)]))
+    assert index._gram_ids is None
+    assert index.mask("model-9").sum() == 11
+
+
+def test_search_indexes_are_built_for_searched_columns_only():
+    snapshot = Snapshot("id", make_frame())
+    snapshot_mask(snapshot, [], [], SEARCH_COLUMNS, None)
+    assert not any(snapshot.has(("search", c)) for c in make_frame().columns)
+    snapshot_mask(snapshot, [], [], SEARCH_COLUMNS, "country: spain")
+    assert snapshot.has(("search", "country"))
+    assert not snapshot.has(("search", "name")) and not snapshot.has(("search", "team"))
@@ -0,0 +1,143 @@
+import gc
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import Leaderboard, SelectColumns, sources
+from gradio_leaderboard.sources import (
+    RefreshingSource,
+    file_version,
+    read_header,
+    read_table,
+)
+
+
+def test_read_table_caches_local_files(tmp_path):
+    path = tmp_path / "leaderboard.csv"
+    pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]}).to_csv(path, index=False)
+    sources._file_cache.clear()
+    df = read_table(str(path))
+    assert read_table(path) is df
+    assert read_table(path, ["score"]).columns.tolist() == ["score"]
+    assert sources._file_cache.info().hits == 2
+
+
+def test_read_table_passes_urls_to_pandas(tmp_path):
+    path = tmp_path / "leaderboard.csv"
+    expected = pd.DataFrame({"model": ["a", "b"], "score": [1.0, 2.0]})
+    expected.to_csv(path, index=False)
+    url = path.as_uri()
+    assert file_version(url) is None
+    pd.testing.assert_frame_equal(read_table(url), expected)
+    assert read_header(url).columns.tolist() == ["model", "score"]
+
+
+def test_refreshing_source_runs_until_its_leaderboard_is_collected():
+    scores = [0.0, 0.0, 1.0]
+    loads = []
+
+    def loader():
+        loads.append(None)
+        score = scores[min(len(loads), len(scores)) - 1]
+        return pd.DataFrame({"model": ["a"], "score": [score]})
+
+    source = RefreshingSource(loader)
+    assert source.get()[0]["score"].tolist() == [0.0]
+    assert not source.refresh()
+    assert source.refresh()
+    assert source.latest[0]["score"].tolist() == [1.0]
+
+    leaderboard = Leaderboard(loader, every=0.01, search_columns=["model"])
+    refresher = leaderboard._source
+    refresher.start()
+    thread = refresher._thread
+    deadline = time.monotonic() + 5
+    while len(loads) < 10 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert len(loads) >= 10
+    del leaderboard
+    gc.collect()
+    thread.join(5)
+    assert not thread.is_alive()
+
+
+def make_frame(rows: int = 10) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "model": [f"model-{i}" for i in range(rows)],
+            "s1": [float(i) for i in range(rows)],
+            "s2": list(range(rows)),
+            "notes": [f"note {i}" for i in range(rows)],
+        }
+    )
+
+
+def write(df: pd.DataFrame, path) -> None:
+    if path.suffix == ".parquet":
+        df.to_parquet(path)
+    else:
+        df.to_feather(path)
+
+
+@pytest.fixture(params=["parquet", "feather"])
+def table_file(request, tmp_path, monkeypatch):
+    """The path of a leaderboard file and the columns of every read of it."""
+    reads = []
+    reader = getattr(pd, f"read_{request.param}")
+
+    def spy(path, columns=None, **kwargs):
+        reads.append(columns)
+        return reader(path, columns=columns, **kwargs)
+
+    monkeypatch.setattr(pd, f"read_{request.param}", spy)
+    sources._file_cache.clear()
+    path = tmp_path / f"leaderboard.{request.param}"
+    write(make_frame(), path)
+    return path, reads
+
+
+def test_unselectable_columns_are_not_read(table_file):
+    path, reads = table_file
+    leaderboard = Leaderboard(
+        str(path),
+        search_columns=["model"],
+        filter_columns=["s2"],
+        select_columns=SelectColumns(default_selection=["model", "s1"], allow=False),
+    )
+    payload = leaderboard.postprocess(str(path))
+    assert payload.headers == ["model", "s1", "s2"]
+    assert reads and all(columns == ["model", "s1", "s2"] for columns in reads)
+
+
+def test_lazy_columns_read_the_whole_file_in_preprocess(table_file):
+    path, reads = table_file
+    leaderboard = Leaderboard(
+        str(path),
+        search_columns=["model"],
+        select_columns=SelectColumns(default_selection=["model", "s1"]),
+        lazy_columns=True,
+    )
+    payload = leaderboard.postprocess(str(path))
+    assert payload.headers == ["model", "s1"]
+    assert None not in reads
+    pd.testing.assert_frame_equal(leaderboard.preprocess(payload), make_frame())
+    assert reads[-1] is None
+
+
+def test_changed_files_are_read_again(table_file):
+    path, reads = table_file
+    leaderboard = Leaderboard(str(path), search_columns=["model"])
+    first = leaderboard.postprocess(str(path))
+    assert leaderboard.postprocess(str(path)) == first
+    count = len(reads)
+    changed = make_frame().assign(s1=lambda df: df["s1"] * 2)
+    write(changed, path)
+    # a rewrite within the resolution of the file system clock would go unnoticed
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = leaderboard.postprocess(str(path))
+    assert len(reads) == count + 1
+    assert second.version != first.version
+    assert [row[1] for row in second.data] == changed["s1"].tolist()
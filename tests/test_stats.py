@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import ColumnFilter, Leaderboard
+from gradio_leaderboard.stats import compute_filter_stats
+
+
+def make_frame() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(0, 100, 200).round(2)
+    scores[::7] = np.nan
+    return pd.DataFrame(
+        {
+            "model": [f"model-{i}" for i in range(200)],
+            "score": scores,
+            "float32": scores.astype("float32"),
+            "params": rng.integers(-5, 180, 200),
+            "nullable": pd.array(
+                [None if i % 5 == 0 else i for i in range(200)], dtype="Int64"
+            ),
+            "missing": np.full(200, np.nan),
+            "merged": rng.random(200) < 0.5,
+            "type": pd.Categorical(rng.choice(["chat", "base", None], 200)),
+            "license": rng.choice(["mit", "apache-2.0", None], 200).tolist(),
+        }
+    )
+
+
+def same(a, b) -> bool:
+    if pd.isna(a) and pd.isna(b):
+        return True
+    return a == pytest.approx(b)
+
+
+@pytest.mark.parametrize("column", ["score", "float32", "params", "nullable", "missing"])
+def test_slider_stats_match_pandas(column):
+    series = make_frame()[column]
+    stats = compute_filter_stats(make_frame(), [column])[column]
+    assert stats.filter_type == "slider"
+    low, high = stats.default
+    assert same(low, series.quantile(0.25)) and same(high, series.quantile(0.70))
+    assert same(stats.min, series.min()) and same(stats.max, series.max())
+    if column in ["params", "nullable"]:
+        assert stats.min == series.min() and type(stats.max) is type(series.max())
+
+
+@pytest.mark.parametrize("column", ["type", "license"])
+def test_checkboxgroup_choices_match_pandas(column):
+    series = make_frame()[column]
+    stats = compute_filter_stats(make_frame(), [column])[column]
+    assert stats.filter_type == "checkboxgroup"
+    values = series.unique().tolist()
+    assert [v for v, _ in stats.choices] == values
+    assert [label for _, label in stats.choices] == values
+    assert stats.default == stats.choices
+
+
+def test_boolean_columns_are_checkboxes():
+    stats = compute_filter_stats(make_frame(), ["merged"])["merged"]
+    assert (stats.filter_type, stats.default) == ("checkbox", False)
+
+
+def test_unknown_columns():
+    with pytest.raises(ValueError, match="not found"):
+        compute_filter_stats(make_frame(), ["size"])
+
+
+@pytest.mark.parametrize(
+    "bins, labels",
+    [
+        ([0, 25, 50, 100], None),
+        ([-10, 10, 90.5], ["low", "high"]),
+        ([10, 20], [("between", "ignored")]),
+    ],
+)
+def test_bucket_filters_match_pd_cut(bins, labels):
+    df = make_frame()
+    leaderboard = Leaderboard(
+        df,
+        search_columns=["model"],
+        filter_columns=[ColumnFilter("score", bins=bins, choices=labels)],
+        server_side=True,
+        page_size=1000,
+    )
+    column = leaderboard.filter_columns[0]
+    assert column.type == "bucket"
+    expected_labels = labels or [f"({a}, {b}]" for a, b in zip(bins, bins[1:])]
+    expected_labels = [
+        label[0] if isinstance(label, tuple) else label for label in expected_labels
+    ]
+    assert column.choices == [(label, i) for i, label in enumerate(expected_labels)]
+    assert column.default == column.choices
+    version = leaderboard.postprocess(df).version
+    buckets = pd.cut(df["score"], bins, labels=False)
+    for selected in [[0], list(range(len(bins) - 1)), []]:
+        page = leaderboard.query(
+            {"version": version, "filters": [["score", selected]]}
+        )
+        expected = df["model"][buckets.isin(selected)].tolist()
+        assert [row[0] for row in page["data"] if row] == expected
+
+
+@pytest.mark.parametrize(
+    "column, match",
+    [
+        (ColumnFilter("license", bins=[0, 1]), "must be numeric"),
+        (ColumnFilter("score", bins=[0]), "strictly increasing"),
+        (ColumnFilter("score", bins=[0, 50, 50]), "strictly increasing"),
+        (ColumnFilter("score", bins=[0, 50, 100], choices=["low"]), "2 buckets but 1 labels"),
+    ],
+)
+def test_invalid_bucket_filters(column, match):
+    with pytest.raises(ValueError, match=match):
+        Leaderboard(make_frame(), search_columns=["model"], filter_columns=[column])
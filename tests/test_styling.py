@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gradio_leaderboard import styling
+from gradio_leaderboard.styling import StyleMetadata
+
+
+def translate(styler):
+    """Display values and CSS of every cell, from the HTML render tree of the Styler
+    as the component originally extracted them."""
+    translated = styler._compute()._translate(None, None)
+    styles = translated.get("cellstyle", [])
+    display_value, styling = [], []
+    for row in translated["body"]:
+        cells = [cell for cell in row if cell["type"] == "td"]
+        display_value.append([cell["display_value"] for cell in cells])
+        styling.append(
+            [
+                "; ".join(
+                    f"{prop}: {value}"
+                    for style in styles
+                    if cell["id"] in style.get("selectors", [])
+                    for prop, value in style.get("props", [])
+                )
+                for cell in cells
+            ]
+        )
+    return display_value, styling
+
+
+def make_styler():
+    rng = np.random.default_rng(0)
+    scores = rng.uniform(0, 100, (40, 3)).round(3)
+    scores[::9, 1] = np.nan
+    df = pd.DataFrame(scores, columns=["s1", "s2", "s3"])
+    df.insert(0, "model", [f"model-{i}" for i in range(40)])
+    df["params"] = rng.integers(1, 70, 40)
+    return (
+        df.style.highlight_max(subset=["s1", "s2"], color="green")
+        .highlight_min(subset=["s1"], color="red")
+        .map(lambda v: "color: blue" if v > 50 else None, subset=["s3", "params"])
+        .map(lambda v: "font-weight: bold" if v > 80 else None, subset=["s3"])
+        .format(precision=1)
+        .format("{:.2f}", subset=["s2"], na_rep="-")
+        .format(lambda v: v.upper(), subset=["model"])
+    )
+
+
+@pytest.fixture(autouse=True)
+def small_chunks(monkeypatch):
+    # several chunks without a table large enough for _translate to truncate
+    monkeypatch.setattr(styling, "CHUNK_SIZE", 7)
+
+
+@pytest.mark.parametrize(
+    "rows, columns",
+    [
+        (None, None),
+        ([0, 6, 7, 8, 13, 14, 39], None),
+        ([39, 20, 3, 3], [4, 0, 2]),
+        (list(range(6, 22)), [3]),
+    ],
+)
+def test_style_metadata_matches_translate(rows, columns):
+    styler = make_styler()
+    display_value, styles = translate(styler)
+    window = StyleMetadata(styler).window(rows, columns)
+    rows = range(40) if rows is None else rows
+    columns = range(5) if columns is None else columns
+    assert window["display_value"] == [
+        [display_value[i][j] for j in columns] for i in rows
+    ]
+    palette = window["palette"]
+    assert [[palette[k] for k in row] for row in window["styling"]] == [
+        [styles[i][j] for j in columns] for i in rows
+    ]
+    # each CSS string is sent once, and only if a cell of the window uses it
+    assert len(set(palette)) == len(palette)
+    assert set(palette) == {styles[i][j] for i in rows for j in columns}
+
+
+def test_style_metadata_palette_is_shared_across_chunks():
+    metadata = StyleMetadata(make_styler())
+    window = metadata.window()
+    assert window["palette"][0] == ""
+    assert len(metadata.palette) == len(set(metadata.palette))
+    # styles of the first and last chunks point into the same palette
+    first = {k for row in window["styling"][:7] for k in row}
+    last = {k for row in window["styling"][35:] for k in row}
+    assert first & last - {0}